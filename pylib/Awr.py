@@ -0,0 +1,313 @@
+##################################################################################################
+#  Name:        Awr.py                                                                           #
+#  Author:      agent                                                                            #
+#  Description: Python library for the local AWR/ASH mirror. The mirror is a Sqlite file holding #
+#               copies of the dba_hist_* views used by the history reports (ashlg, ashtime,      #
+#               dbtime, awr_plan_stats, awr_plan_change and unstable_plans). awr_mirror pulls    #
+#               only the snapshots that are new since the last sync, the reports read the mirror #
+#               with their -M option instead of querying the database.                           #
+#  Functions:   FetchView(Session, View, Columns, Where)                                         #
+#               MirrorReport(Db, Sql, Columns, Colsep='')                                        #
+#               MirrorTime(DateStr)                                                              #
+#               OpenMirror(FileName, Create=False)                                               #
+#               SyncMirror(Session, Db, Batch=24, Verbose=False, Stats=None)                     #
+#                                                                                                #
+#  Tables:      The mirror tables have the names of the views they copy and the columns listed  #
+#               in MirrorViews. Dates are stored as 'YYYY-MM-DD HH24:MI:SS' text so they compare #
+#               correctly as strings (see MirrorTime()). awr_mirror_mark holds the last snapshot #
+#               copied per dbid and instance.                                                    #
+#                                                                                                #
+# History:                                                                                       #
+#                                                                                                #
+# Date       Ver. Who              Change Description                                            #
+# ---------- ---- ---------------- ------------------------------------------------------------- #
+# 10/19/2026 1.00 agent            Initial release.                                              #
+# 10/19/2026 1.10 agent            SyncMirror() Stats defaults to None. OpenMirror() only        #
+#                                  creates the mirror file when Create=True (awr_mirror).        #
+##################################################################################################
+
+# --------------------------------------
+# ---- Import Python Modules -----------
+# --------------------------------------
+from math            import sqrt
+from os.path         import isfile
+from sqlite3         import connect
+from sys             import exit
+from time            import time
+
+# --------------------------------------
+# ---- Constants -----------------------
+# --------------------------------------
+# Views copied per snapshot: (view, [(column, type)]). Every view starts
+# with the dbid, instance_number, snap_id key. DATE columns are fetched
+# with TO_CHAR() and stored as TEXT.
+MirrorViews = [
+  ('dba_hist_snapshot', [
+    ('dbid',                        'INTEGER'),
+    ('instance_number',             'INTEGER'),
+    ('snap_id',                     'INTEGER'),
+    ('startup_time',                'DATE'),
+    ('begin_interval_time',         'DATE'),
+    ('end_interval_time',           'DATE')]),
+  ('dba_hist_sys_time_model', [
+    ('dbid',                        'INTEGER'),
+    ('instance_number',             'INTEGER'),
+    ('snap_id',                     'INTEGER'),
+    ('stat_name',                   'TEXT'),
+    ('value',                       'INTEGER')]),
+  ('dba_hist_sqlstat', [
+    ('dbid',                        'INTEGER'),
+    ('instance_number',             'INTEGER'),
+    ('snap_id',                     'INTEGER'),
+    ('sql_id',                      'TEXT'),
+    ('plan_hash_value',             'INTEGER'),
+    ('executions_delta',            'INTEGER'),
+    ('elapsed_time_delta',          'INTEGER'),
+    ('cpu_time_delta',              'INTEGER'),
+    ('buffer_gets_delta',           'INTEGER'),
+    ('disk_reads_delta',            'INTEGER')]),
+  ('dba_hist_active_sess_history', [
+    ('dbid',                        'INTEGER'),
+    ('instance_number',             'INTEGER'),
+    ('snap_id',                     'INTEGER'),
+    ('sample_id',                   'INTEGER'),
+    ('sample_time',                 'DATE'),
+    ('session_id',                  'INTEGER'),
+    ('session_type',                'TEXT'),
+    ('user_id',                     'INTEGER'),
+    ('sql_id',                      'TEXT'),
+    ('delta_time',                  'INTEGER'),
+    ('delta_read_io_requests',      'INTEGER'),
+    ('delta_write_io_requests',     'INTEGER'),
+    ('delta_read_io_bytes',         'INTEGER'),
+    ('delta_write_io_bytes',        'INTEGER'),
+    ('delta_interconnect_io_bytes', 'INTEGER'),
+    ('pga_allocated',               'INTEGER'),
+    ('temp_space_allocated',        'INTEGER')]),
+]
+
+# Not per snapshot, replaced on every sync (the ashlg user names).
+UserColumns = [('dbid', 'INTEGER'), ('user_id', 'INTEGER'), ('username', 'TEXT')]
+
+DateFormat = 'YYYY-MM-DD HH24:MI:SS'
+
+# ---------------------------------------------------------------------------
+# Def : OpenMirror()
+# Desc: Opens the Sqlite file holding the AWR mirror. Only the sync
+#       (awr_mirror) creates the file, the reports exit if it isn't there
+#       so a mistyped -M doesn't report from a new, empty mirror.
+# Args: 1-Mirror file name (FileName)
+#       2-Create the file if it doesn't exist (Create)
+# Retn: Sqlite connection
+# ---------------------------------------------------------------------------
+def OpenMirror(FileName, Create=False):
+  if (not Create and not isfile(FileName)):
+    print("\nAWR mirror file not found: %s" % FileName)
+    exit(1)
+
+  Tables = [
+    'CREATE TABLE IF NOT EXISTS awr_mirror_mark (dbid INTEGER, instance_number INTEGER, snap_id INTEGER, PRIMARY KEY (dbid, instance_number));',
+    'CREATE TABLE IF NOT EXISTS dba_users (' + ', '.join([ col + ' ' + type for (col, type) in UserColumns ]) + ');',
+    'CREATE INDEX IF NOT EXISTS dba_users_ix ON dba_users (dbid, user_id);',
+  ]
+  for (View, Columns) in MirrorViews:
+    Tables.append('CREATE TABLE IF NOT EXISTS ' + View + ' (' + ', '.join([ col + ' ' + type.replace('DATE', 'TEXT') for (col, type) in Columns ]) + ');')
+    Tables.append('CREATE INDEX IF NOT EXISTS ' + View + '_ix ON ' + View + ' (dbid, instance_number, snap_id);')
+  Tables.append('CREATE INDEX IF NOT EXISTS dba_hist_sqlstat_ix_sql_id ON dba_hist_sqlstat (sql_id);')
+
+  try:
+    Db = connect(FileName, isolation_level=None)
+    for sql in Tables:
+      Db.execute(sql)
+  except:
+    print("Cannot open AWR mirror file: %s" % FileName)
+    exit(1)
+
+  # Oracle's STDDEV() is rebuilt from sums in unstable_plans.
+  Db.create_function('sqrt', 1, lambda x: sqrt(x) if x is not None and x >= 0 else None)
+  return(Db)
+# ---------------------------------------------------------------------------
+# End OpenMirror()
+# ---------------------------------------------------------------------------
+
+
+# ---------------------------------------------------------------------------
+# Def : MirrorTime()
+# Desc: Pads a date accepted by ValidateDate() (YYYY-MM-DD[ HH24[:MI[:SS]]])
+#       to the full 'YYYY-MM-DD HH24:MI:SS' form stored in the mirror, so
+#       it compares like TO_DATE() would.
+# Args: 1-Date string (DateStr)
+# Retn: Padded date string
+# ---------------------------------------------------------------------------
+def MirrorTime(DateStr):
+  return(DateStr + '0000-01-01 00:00:00'[len(DateStr):])
+# ---------------------------------------------------------------------------
+# End MirrorTime()
+# ---------------------------------------------------------------------------
+
+
+# ---------------------------------------------------------------------------
+# Def : FetchView()
+# Desc: Runs one query against a dba_hist_* view over the sqlplus session
+#       and converts the rows for the mirror (NULL to None, numbers to int
+#       or float). Prints the errors and exits if the query fails.
+# Args: 1-SqlSession() object (Session)
+#       2-View name (View)
+#       3-Columns from MirrorViews (Columns)
+#       4-Where clause (Where)
+# Retn: List of row tuples
+# ---------------------------------------------------------------------------
+def FetchView(Session, View, Columns, Where):
+  Select = []
+  for (col, type) in Columns:
+    if (type == 'DATE'):
+      Select.append("TO_CHAR(" + col + ", '" + DateFormat + "')")
+    else:
+      Select.append(col)
+  Sql = 'SELECT ' + ', '.join(Select) + ' FROM ' + View + ' WHERE ' + Where + ';'
+
+  Rows = Session.query(Sql)
+  if (Session.rc != 0):
+    print('\n%s' % Sql)
+    print(Session.msg)
+    for Error in Session.errors:
+      print(Error[1])
+    exit(1)
+
+  Types  = [ type for (col, type) in Columns ]
+  Result = []
+  for Row in Rows:
+    Values = []
+    for (value, type) in zip(Row, Types):
+      if (value == ''):
+        value = None
+      elif (type == 'INTEGER'):
+        try:
+          value = int(value)
+        except ValueError:
+          value = float(value)
+      Values.append(value)
+    Result.append(tuple(Values))
+  return(Result)
+# ---------------------------------------------------------------------------
+# End FetchView()
+# ---------------------------------------------------------------------------
+
+
+# ---------------------------------------------------------------------------
+# Def : SyncMirror()
+# Desc: Pulls the snapshots taken since the last sync into the mirror. The
+#       new snapshots are found with one query against dba_hist_snapshot
+#       (snap_id above the mark of its dbid and instance), then each view
+#       is copied Batch snapshots at a time by dbid, instance_number and
+#       snap_id range. Each batch is committed with its mark, so an
+#       interrupted sync picks up where it stopped. dba_users is replaced.
+# Args: 1-SqlSession() object (Session)
+#       2-Mirror connection from OpenMirror() (Db)
+#       3-Snapshots per batch (Batch)
+#       4-Print a line per batch (Verbose)
+#       5-Dictionary filled with row counts per view for the caller (Stats)
+# Retn: Number of snapshots pulled
+# ---------------------------------------------------------------------------
+def SyncMirror(Session, Db, Batch=24, Verbose=False, Stats=None):
+  if (Stats is None):
+    Stats = {}
+  Curs = Db.cursor()
+  for (View, Columns) in MirrorViews:
+    Stats[View] = 0
+
+  Marks = {}
+  for (dbid, inst, snap_id) in Curs.execute('SELECT dbid, instance_number, snap_id FROM awr_mirror_mark;').fetchall():
+    Marks[(dbid, inst)] = snap_id
+
+  Where = 'snap_id > 0'
+  if (Marks):
+    Where  = "snap_id > DECODE(dbid || ':' || instance_number, "
+    Where += ', '.join([ "'%s:%s', %s" % (key[0], key[1], Marks[key]) for key in sorted(Marks) ]) + ', 0)'
+  (View, Columns) = MirrorViews[0]
+  Snapshots = FetchView(Session, View, Columns, Where + ' ORDER BY dbid, instance_number, snap_id')
+
+  Groups = {}
+  for Row in Snapshots:
+    Groups.setdefault((Row[0], Row[1]), []).append(Row)
+
+  for Key in sorted(Groups):
+    SnapRows = Groups[Key]
+    for i in range(0, len(SnapRows), Batch):
+      Start = time()
+      Chunk = SnapRows[i:i + Batch]
+      Where = 'dbid = %s AND instance_number = %s AND snap_id BETWEEN %s AND %s' % (Key[0], Key[1], Chunk[0][2], Chunk[-1][2])
+      Curs.execute('BEGIN')
+      Curs.executemany('INSERT INTO ' + View + ' VALUES (' + ', '.join(['?'] * len(Columns)) + ');', Chunk)
+      Stats[View] += len(Chunk)
+      for (HistView, HistColumns) in MirrorViews[1:]:
+        Rows = FetchView(Session, HistView, HistColumns, Where)
+        Curs.executemany('INSERT INTO ' + HistView + ' VALUES (' + ', '.join(['?'] * len(HistColumns)) + ');', Rows)
+        Stats[HistView] += len(Rows)
+      Curs.execute('INSERT OR REPLACE INTO awr_mirror_mark VALUES (?, ?, ?);', (Key[0], Key[1], Chunk[-1][2]))
+      Curs.execute('COMMIT')
+      if (Verbose):
+        print('dbid %s instance %s: snapshots %s-%s in %.2f sec.' % (Key[0], Key[1], Chunk[0][2], Chunk[-1][2], time() - Start))
+
+  Users = FetchView(Session, 'dba_users u, v$database d', [('d.dbid', 'INTEGER'), ('u.user_id', 'INTEGER'), ('u.username', 'TEXT')], '1 = 1')
+  if (Users):
+    Curs.execute('BEGIN')
+    Curs.execute('DELETE FROM dba_users WHERE dbid = ?;', (Users[0][0],))
+    Curs.executemany('INSERT INTO dba_users VALUES (?, ?, ?);', Users)
+    Curs.execute('COMMIT')
+
+  return(len(Snapshots))
+# ---------------------------------------------------------------------------
+# End SyncMirror()
+# ---------------------------------------------------------------------------
+
+
+# ---------------------------------------------------------------------------
+# Def : MirrorReport()
+# Desc: Runs a report query against the mirror and prints the result the
+#       way sqlplus would: a heading, a line of dashes and one line per
+#       row (text left aligned, numbers right aligned). With Colsep the
+#       rows are printed unformatted, separated by Colsep, with no heading.
+# Args: 1-Mirror connection from OpenMirror() (Db)
+#       2-Sqlite query (Sql)
+#       3-List of (heading, width, format spec) per column, an empty format
+#         spec is text, e.g. ('DB Time (min)', 15, ',.2f') (Columns)
+#       4-Column separator for CSV output (Colsep)
+# Retn: Number of rows printed
+# ---------------------------------------------------------------------------
+def MirrorReport(Db, Sql, Columns, Colsep=''):
+  Rows = Db.execute(Sql).fetchall()
+  if (Colsep != ''):
+    for Row in Rows:
+      print(Colsep.join([ '' if value is None else str(value) for value in Row ]))
+    return(len(Rows))
+
+  Widths  = [ max(width, len(heading)) for (heading, width, spec) in Columns ]
+  Heading = []
+  for i, (heading, width, spec) in enumerate(Columns):
+    if (spec == ''):
+      Heading.append(heading.ljust(Widths[i]))
+    else:
+      Heading.append(heading.rjust(Widths[i]))
+  print('')
+  print(' '.join(Heading))
+  print(' '.join([ '-' * width for width in Widths ]))
+
+  for Row in Rows:
+    Line = []
+    for i, value in enumerate(Row):
+      spec = Columns[i][2]
+      if (value is None):
+        Line.append(' ' * Widths[i])
+      elif (spec == ''):
+        Line.append(str(value).ljust(Widths[i]))
+      else:
+        Line.append(format(value, spec).rjust(Widths[i]))
+    print(' '.join(Line))
+
+  if (Rows == []):
+    print('\nno rows selected')
+  return(len(Rows))
+# ---------------------------------------------------------------------------
+# End MirrorReport()
+# ---------------------------------------------------------------------------
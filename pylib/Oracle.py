@@ -30,12 +30,14 @@
 #               PrintError(Sql, Stdout, ErrorList=[])                                            #
 #               PrintMessage(msg, tag='')                                                        #
 #               ProcessConfig(ConfigFile, Section)                                               #
+#               Redraw(Screen, Lines)                                                            #
 #               RunDgmgrl(DgbCmd, ErrChk=True, ConnectString='/')                                #
 #               RunRman(RCV, ErrChk=True, ConnectString='target /')                              #
 #               RunSqlplus(Sql, ErrChk=False, ConnectString='/ as sysdba')                       #
 #               RunSudo(cmdline)                                                                 #
 #               SetOracleEnv(Sid, Oratab='/etc/oratab')                                          #
 #               SqlQuery()                                                                       #
+#               SqlSession()                                                                     #
 #               SqlReport()                                                                      #
 #               TnsCheck(TnsName)                                                                #
 #               ValidateDate(DateStr)                                                            #
@@ -96,6 +98,12 @@
 # 02/19/2021 2.52 Randy Johnson    Fixed bug in execute_sql() where table list was not           #
 #                                  initialized.                                                  #
 # 02/22/2021 2.53 Randy Johnson    Changed table from list of lists to list of tuples.           #
+# 10/19/2026 2.54 agent            Added SqlSession() (persistent sqlplus session, one query per #
+#                                  call, rows split on a fixed colsep).                          #
+# 10/19/2026 2.55 agent            Moved Redraw() here from monitor_rman.                        #
+# 10/19/2026 2.56 agent            SqlSession() can be opened for a given SID/home without       #
+#                                  changing the environment of the process.                      #
+# 10/19/2026 2.57 agent            Added GetRunningInstances() (pmon discovery from /proc).      #
 ##################################################################################################
 
 # --------------------------------------
@@ -119,10 +127,15 @@ from os           import getpgid
 from os           import unlink
 from os           import getpgid
 from os           import unlink
+from os           import listdir
+from os           import readlink
+from os           import stat as osstat
+from os           import sysconf
 from os           import W_OK as WriteOk
 from os           import R_OK as ReadOk
 from os           import X_OK as ExecOk
 from os.path      import basename
+from os.path      import dirname
 from os.path      import isfile
 from os.path      import isdir
 from os.path      import join as pathjoin
@@ -478,6 +491,33 @@ def PrintMessage(msg, tag=''):
 # End PrintMessage()
 # --------------------------------------------------------------------------------------------------
 
+# --------------------------------------------------------------------------------------------------
+# Name: Redraw()
+# Desc: Writes a screen of lines. On a terminal only the lines that differ from what is already
+#       on the screen are rewritten (cursor addressing), otherwise the whole screen is printed.
+# Args: Screen - lines currently on the screen ([] forces a full redraw)
+#       Lines  - new lines
+# Retn: Lines (the new screen)
+# --------------------------------------------------------------------------------------------------
+def Redraw(Screen, Lines):
+  if (not termout.isatty()):
+    print('\n'.join(Lines) + '\n')
+    return(Lines)
+
+  if (Screen == []):
+    termout.write('\033[H\033[2J')
+  for i, Line in enumerate(Lines):
+    if (i >= len(Screen) or Screen[i] != Line):
+      termout.write('\033[%d;1H%s\033[K' % (i + 1, Line))
+  if (len(Lines) < len(Screen)):
+    termout.write('\033[%d;1H\033[J' % (len(Lines) + 1))
+  termout.write('\033[%d;1H' % (len(Lines) + 1))
+  termout.flush()
+  return(Lines)
+# --------------------------------------------------------------------------------------------------
+# End Redraw()
+# --------------------------------------------------------------------------------------------------
+
 # --------------------------------------------------------------------------------------------------
 # Name: RunSudo()
 # Desc: Calls an external command/script with sudo.
@@ -880,6 +920,168 @@ class SqlExec:
 # End SqlExec()
 # ---------------------------------------------------------------------------
 
+# ---------------------------------------------------------------------------
+# Clas: SqlSession
+# Desc: Keeps one sqlplus process (one database session) open so that a
+#       query can be run over and over (ex: monitoring loops) without
+#       paying for a sqlplus start and login on every execution. Each
+#       query is followed by a prompt of a marker line and the output is
+#       read up to the marker. Rows come back as lists of column values
+#       (sqlplus colsep is set to SqlSession.colsep). query(sql, raw=True)
+#       returns the output lines as they are (ex: CLOBs).
+#       If sid is passed the session runs with its own ORACLE_SID and
+#       ORACLE_HOME (home defaults to the oratab entry) and the environment
+#       of this process is left alone, so sessions for several databases can
+#       be opened at the same time (ex: one per thread).
+#       ex:
+#         Session = SqlSession()
+#         if Session.rc == 0:
+#           Rows = Session.query("select name, value from v$sysstat;")
+#         Session.close()
+# ---------------------------------------------------------------------------
+class SqlSession:
+  colsep = '~|~'
+
+  def __init__(self, connstr='/ as sysdba', sid='', home=''):
+    self.connstr = connstr
+    self.errors  = []
+    self.rc      = 0
+    self.msg     = ''
+    self.proc    = None
+    self.env     = None
+    self.marker  = '-- SqlSession end of output --'
+
+    for self.var in ['SQLPATH', 'ORACLE_PATH']:
+      try:
+        del environ[self.var]
+      except:
+        pass
+
+    if (sid != ''):
+      if (home == ''):
+        home = LoadOratab().get(sid, '')
+      if (home == ''):
+        self.rc  = 1
+        self.msg = 'ORACLE_SID not found in oratab: ' + sid
+        return
+      self.env = dict(environ)
+      self.env['ORACLE_SID']  = sid
+      self.env['ORACLE_HOME'] = home
+      if (self.env.get('LD_LIBRARY_PATH', '') != ''):
+        self.env['LD_LIBRARY_PATH'] = home + '/lib' + ':' + self.env['LD_LIBRARY_PATH']
+      else:
+        self.env['LD_LIBRARY_PATH'] = home + '/lib'
+      self.sqlplus = pathjoin(home, 'bin', 'sqlplus')
+    else:
+      if (self.connstr == '/ as sysdba' and not('ORACLE_SID' in environ.keys())):
+        self.rc  = 1
+        self.msg = 'ORACLE_SID must be set if connect string is: \'' + self.connstr + '\''
+        return
+      if (not('ORACLE_HOME' in environ.keys()) and 'ORACLE_SID' in environ.keys()):
+        SetOracleEnv(environ['ORACLE_SID'])
+      if (not('ORACLE_HOME' in environ.keys())):
+        self.rc  = 1
+        self.msg = 'ORACLE_HOME is not set'
+        return
+      self.sqlplus = pathjoin(environ['ORACLE_HOME'], 'bin', 'sqlplus')
+
+    # Start sqlplus and login
+    try:
+      self.proc = Popen([self.sqlplus, '-S', '-L', self.connstr], stdin=PIPE, stdout=PIPE, stderr=STDOUT, \
+       shell=False, universal_newlines=True, env=self.env)
+    except:
+      self.rc  = 1
+      self.msg = 'Cannot start sqlplus: ' + self.sqlplus
+      return
+
+    self.header  = ''
+    self.header += "set echo            off\n"
+    self.header += "set feedback        off\n"
+    self.header += "set flush           on\n"
+    self.header += "set heading         off\n"
+    self.header += "set linesize        32767\n"
+    self.header += "set numwidth        20\n"
+    self.header += "set pagesize        0\n"
+    self.header += "set serveroutput    off\n"
+    self.header += "set tab             off\n"
+    self.header += "set trimout         on\n"
+    self.header += "set verify          off\n"
+    self.header += "set colsep          \"" + SqlSession.colsep + "\"\n"
+    self.header += "whenever sqlerror continue\n"
+
+    # Make sure the login worked before handing the session out. If
+    # sqlplus quit before it read the query its login errors are still
+    # waiting in the pipe. The ORA-/SP2- errors are reported rather than
+    # the session ending.
+    self.query('select 1 from dual;')
+    if (self.rc != 0):
+      if (self.errors == [] and self.proc.poll() is not None):
+        try:
+          for self.line in self.proc.stdout.read().splitlines():
+            self.found = match(r'^((?:ORA|SP2|TNS)-[0-9]+)', self.line.strip())
+            if (self.found):
+              self.errors.append([self.found.group(1), self.line.strip()])
+        except:
+          pass
+      if (self.errors):
+        self.msg = 'Login failed: ' + ' '.join([ self.err[1] for self.err in self.errors ])
+  # End __init__()
+
+  def query(self, sql, raw=False):
+    self.errors = []
+    self.rows   = []
+    self.rc     = 0
+    self.msg    = ''
+    if (self.proc is None or self.proc.poll() is not None):
+      self.rc  = 1
+      self.msg = 'The sqlplus session is not running.'
+      return []
+
+    try:
+      self.proc.stdin.write(self.header + sql.rstrip() + '\nprompt ' + self.marker + '\n')
+      self.proc.stdin.flush()
+      self.header = ''
+    except:
+      self.rc  = 1
+      self.msg = 'The sqlplus session ended unexpectedly.'
+      return []
+
+    while True:
+      self.line = self.proc.stdout.readline()
+      if (self.line == ''):
+        self.rc  = 1
+        self.msg = 'The sqlplus session ended unexpectedly.'
+        break
+      self.line = self.line.rstrip('\n')
+      if (self.line == self.marker):
+        break
+      self.found = match(r'^((?:ORA|SP2|TNS)-[0-9]+)', self.line.strip())
+      if (self.found):
+        self.errors.append([self.found.group(1), self.line.strip()])
+      elif (raw):
+        self.rows.append(self.line)
+      elif (self.line.strip() != ''):
+        self.rows.append([ self.col.strip() for self.col in self.line.split(SqlSession.colsep) ])
+
+    if (self.errors):
+      self.rc = 1
+    return self.rows
+  # End query()
+
+  def close(self):
+    if (self.proc is not None and self.proc.poll() is None):
+      try:
+        self.proc.stdin.write('exit\n')
+        self.proc.stdin.flush()
+        self.proc.wait()
+      except:
+        pass
+    self.proc = None
+  # End close()
+# ---------------------------------------------------------------------------
+# End SqlSession
+# ---------------------------------------------------------------------------
+
 # ---------------------------------------------------------------------------
 # Clas: SqlQuery
 # Desc: Runs a query in sqlplus and parses it into a table (list of lists).
@@ -2620,6 +2822,116 @@ def GetAsmHome(Oratab='/etc/oratab'):
 # ---------------------------------------------------------------------------
 
 
+# ---------------------------------------------------------------------------
+# Def : GetRunningInstances()
+# Desc: Finds the instances running on this host by their pmon process
+#       (ora_pmon_<sid>, asm_pmon_<sid>, apx_pmon_<sid>, ...). Reads /proc
+#       directly instead of parsing ps output: /proc/<pid>/comm (15 chars)
+#       is the cheap filter, cmdline gives the full SID for the few pmon
+#       processes. ORACLE_HOME is resolved from /proc/<pid>/exe, then
+#       ORACLE_HOME in /proc/<pid>/environ, then the oratab; exe and environ
+#       are only readable for our own processes (or as root).
+#       Where there is no Linux style /proc it falls back to ps, in which
+#       case the start time is not available (None).
+# Args: ProcDir (default /proc)
+# Retn: {Sid: {'pid': int, 'owner': str, 'started': datetime or None,
+#              'home': str, 'prefix': 'ora'|'asm'|...}}
+#       {} if no instances are running.
+# ---------------------------------------------------------------------------
+def GetRunningInstances(ProcDir='/proc'):
+  Instances = {}
+  PmonMatch = compile(r'^([a-z]+)_pmon_(\S+)$')
+  Oratab    = None
+
+  if (not isfile(pathjoin(ProcDir, 'self', 'stat'))):
+    Proc = Popen(['ps', '-e', '-o', 'pid=', '-o', 'user=', '-o', 'args='], stdin=PIPE, stdout=PIPE, stderr=STDOUT, shell=False, universal_newlines=True, close_fds=True)
+    (Stdout, Stderr) = Proc.communicate()
+    Oratab = LoadOratab()
+    for line in Stdout.split('\n'):
+      Cols = line.split()
+      if (len(Cols) >= 3):
+        MatchObj = PmonMatch.match(basename(Cols[2]))
+        if (MatchObj):
+          Sid = MatchObj.group(2)
+          Instances[Sid] = {'pid': int(Cols[0]), 'owner': Cols[1], 'started': None, 'home': Oratab.get(Sid, ''), 'prefix': MatchObj.group(1)}
+    return(Instances)
+
+  try:
+    from pwd import getpwuid
+  except ImportError:
+    getpwuid = None
+
+  # Process start times in /proc/<pid>/stat are clock ticks since boot.
+  BootTime = 0
+  try:
+    for line in open(pathjoin(ProcDir, 'stat')):
+      if (line.startswith('btime ')):
+        BootTime = int(line.split()[1])
+  except (IOError, OSError):
+    pass
+  Ticks = sysconf('SC_CLK_TCK')
+
+  for Pid in listdir(ProcDir):
+    if (not Pid.isdigit()):
+      continue
+    PidDir = pathjoin(ProcDir, Pid)
+    try:
+      Comm = open(pathjoin(PidDir, 'comm')).read().strip()
+      if (Comm.find('_pmon_') < 0):
+        continue
+      Args = open(pathjoin(PidDir, 'cmdline')).read().replace('\0', ' ').split()
+      MatchObj = PmonMatch.match(basename(Args[0]))
+      if (not MatchObj):
+        continue
+      Sid  = MatchObj.group(2)
+      Uid  = osstat(PidDir).st_uid
+      Stat = open(pathjoin(PidDir, 'stat')).read()
+    except (IOError, OSError, IndexError):
+      continue                         # process went away, or not an Oracle process
+
+    Owner = str(Uid)
+    if (getpwuid is not None):
+      try:
+        Owner = getpwuid(Uid).pw_name
+      except KeyError:
+        pass
+
+    Started = None
+    try:
+      # Fields after the ')' that closes the command name; starttime is field 22.
+      StartTicks = int(Stat[Stat.rfind(')') + 2:].split()[19])
+      if (BootTime > 0):
+        Started = datetime.fromtimestamp(BootTime + (StartTicks / float(Ticks)))
+    except (ValueError, IndexError):
+      pass
+
+    OracleHome = ''
+    try:
+      Exe = readlink(pathjoin(PidDir, 'exe'))
+      if (Exe.endswith(' (deleted)')):
+        Exe = Exe[:-10]
+      OracleHome = dirname(dirname(Exe))
+    except OSError:
+      try:
+        for Var in open(pathjoin(PidDir, 'environ')).read().split('\0'):
+          if (Var.startswith('ORACLE_HOME=')):
+            OracleHome = Var[12:]
+            break
+      except (IOError, OSError):
+        pass
+    if (OracleHome == ''):
+      if (Oratab is None):
+        Oratab = LoadOratab()
+      OracleHome = Oratab.get(Sid, '')
+
+    Instances[Sid] = {'pid': int(Pid), 'owner': Owner, 'started': Started, 'home': OracleHome, 'prefix': MatchObj.group(1)}
+
+  return(Instances)
+# ---------------------------------------------------------------------------
+# End GetRunningInstances()
+# ---------------------------------------------------------------------------
+
+
 # ---------------------------------------------------------------------------
 # Def : RunSqlplus()
 # Desc: Calls sqlplus and runs a sql script passed in in the Sql parameter.
@@ -0,0 +1,2320 @@
+##################################################################################################
+#  Name:        Osw.py                                                                           #
+#  Author:      agent                                                                            #
+#  Description: Python library for the OSWatcher (OSWbb) tools: oswiostat, oswvmstat, oswps and #
+#               oswall. Holds the file discovery, the per-format parsers, the Sqlite load        #
+#               functions and the query/report functions shared by the tools.                    #
+#  Functions:   AlignedReport(Curs, Table, DataDef, Metric, Keys)                                #
+#               AnalyzeTable(Curs, Table)                                                        #
+#               BucketStart(Ts, Minutes)                                                         #
+#               BuildQuery(Table, DataDef, Columns=[])                                           #
+#               BuildWhere(DataDef)                                                              #
+#               ColumnName(RawName)                                                              #
+#               CreateIndex(Curs, Table, Cols)                                                   #
+#               CreateIndexes(Curs, Table, DataDef, IndexCols)                                   #
+#               CreateRollups(Curs, Table, DataDef, Metrics, Keys, Intervals)                    #
+#               CreateTable(Curs, Table, Header, Sample)                                         #
+#               CsvReport(Curs, Table, DataDef, IndexSort=False)                                 #
+#               DataDefinition(Header, Sample)                                                   #
+#               DefaultReport(Curs, Table, DataDef, IndexSort=False)                             #
+#               EnsureIndexes(Curs, Table, DataDef, IndexSort=False)                             #
+#               Epoch(Timestamp)                                                                 #
+#               ExportColumns(Curs, Table, DataDef, ExportDir, Source, IndexSort=False)          #
+#               FindColumn(Col, DataDef)                                                         #
+#               FollowFile(FileName, FileType, Filter, Interval, Rows, Cmd, SampleSize=1000)     #
+#               InMemory(Curs)                                                                   #
+#               InputFiles(StartingDirectory, FileTypes=[])                                      #
+#               InsertRows(Curs, Sql, Rows)                                                      #
+#               InsertSql(Table, DataDef)                                                        #
+#               LoadStore(Curs, FileDict, Workers=1, Verbose=False, SampleSize=1000)             #
+#               NextFile(FileName, FileType)                                                     #
+#               OpenBaseline(FileName)                                                           #
+#               ParseFile(FileName, FileType='')                                                 #
+#               ParseFiles(FileList, Workers=1, Parse=ParseFile)                                 #
+#               ParseFilter(Filter, DataDef, Cmd)                                                #
+#               ParseIostat(file_name, file_contents)                                            #
+#               ParseOrder(Order, DataDef, DefaultOrder=[])                                      #
+#               ParsePs(file_name, file_contents)                                                #
+#               ParseVmstat(file_name, file_contents)                                            #
+#               Percentile(Values, Pct)                                                          #
+#               PrintDataDefinition(DataDef)                                                     #
+#               RegisterParser(FileType, Parser)                                                 #
+#               RollupTable(Table, Interval)                                                     #
+#               RowMatches(DataDef, Row)                                                         #
+#               RunQuery(Curs, Table, DataDef, Columns=[], IndexSort=False)                      #
+#               ScanAnomalies(Db, FileDict, WindowSecs, Threshold, MinSamples, Stats, Alpha)     #
+#               SortColumns(DataDef)                                                             #
+#               StoreTable(FileType)                                                             #
+#               TuneDatabase(Curs, CacheKb=262144)                                               #
+#               TypeCheck(Val)                                                                   #
+#               WindowMeans(Data, Header, FileType, WindowSecs)                                  #
+#                                                                                                #
+#  Parsers:     A parser takes the name of an OSWatcher file and its text and returns a list of  #
+#               rows, a list of column names and the hostname: (data, header, hostname). The     #
+#               Parsers dictionary maps the file type found in the file name                     #
+#               (<host>_<type>_<yy>.<mm>.<dd>.<hh24mi>.dat) to its parser. Register another      #
+#               format with RegisterParser(). A parser that cannot read a file raises            #
+#               ParseError, ParseFiles() prints it and exits.                                    #
+##################################################################################################
+
+# --------------------------------------
+# ---- Import Python Modules -----------
+# --------------------------------------
+from calendar        import timegm
+from collections     import deque
+from itertools       import chain
+from json            import dump
+from math            import ceil
+from math            import sqrt
+from multiprocessing import Pool
+from os              import listdir
+from os              import makedirs
+from os              import stat
+from os              import walk
+from os.path         import basename
+from os.path         import dirname
+from os.path         import isdir
+from os.path         import join as pathjoin
+from re              import MULTILINE
+from re              import compile
+from re              import finditer
+from re              import match
+from sqlite3         import connect
+from sys             import exit
+from sys             import stdout
+from time            import gmtime
+from time            import sleep
+from time            import strftime
+from time            import strptime
+from time            import time
+
+# --------------------------------------
+# ---- Constants -----------------------
+# --------------------------------------
+Prefix   = 'OSW_'
+MonthMap = {'Jan':'01','Feb':'02','Mar':'03','Apr':'04','May':'05','Jun':'06','Jul':'07','Aug':'08','Sep':'09','Oct':'10','Nov':'11','Dec':'12'}
+
+# ---------------------------------------------------------------------------
+# Clas: ParseError()
+# Desc: Raised by ParseFile() and the parsers when a file cannot be parsed.
+#       The parsers can run in pool worker processes, which must not exit
+#       the program, so the error is raised and reported by the caller.
+# ---------------------------------------------------------------------------
+class ParseError(Exception):
+  pass
+# ---------------------------------------------------------------------------
+# End ParseError()
+# ---------------------------------------------------------------------------
+
+# ---------------------------------------------------------------------------
+# Def : InputFiles()
+# Desc: Walks the directories starting at StartingDirectory once and
+#       classifies every OSWatcher file found by the type in its name
+#       (<host>_<type>_<yy>.<mm>.<dd>.<hh24mi>.dat).
+# Args: 1-Starting Directory (StartingDirectory)
+#       2-List of file types to keep, [] keeps every type (FileTypes)
+# Retn: Dictionary of fully qualified file names & attributes
+#       (name, host, type, and the stat() values).
+# ---------------------------------------------------------------------------
+def InputFiles(StartingDirectory, FileTypes=[]):
+  FileDict = {}
+  Pattern  = compile(r'(^\S+)_([a-z]+)_([0-9]+)\.([0-9]+)\.([0-9]+)\.([0-9]+)\.dat$')
+
+  for (path, dirs, files) in walk(StartingDirectory):
+    for file in files:
+      found = Pattern.search(file)
+      if found:
+        (fhost, ftype, fyear, fmon, fday, ftime) = found.groups()
+        if (FileTypes == [] or ftype in FileTypes):
+          filepath = pathjoin(path,file)
+          (mode,inode,dev,nlink,uid,gid,bytes,atime,mtime,ctime) = stat(filepath)
+          FileDict[filepath] = {
+           'name'  : file,
+           'host'  : fhost,
+           'type'  : ftype,
+           'mode'  : mode,
+           'inode' : inode,
+           'dev'   : dev,
+           'nlink' : nlink,
+           'uid'   : uid,
+           'gid'   : gid,
+           'bytes' : bytes,
+           'atime' : atime,
+           'mtime' : mtime,
+           'ctime' : ctime
+          }
+
+  return(FileDict)
+# ---------------------------------------------------------------------------
+# End InputFiles()
+# ---------------------------------------------------------------------------
+
+
+# ---------------------------------------------------------------------------
+# Def : TypeCheck()
+# Desc: Determines the likely data type of a value.
+# Args: 1-value to evaluate (Val)
+# Retn: 1-data type or None
+# ---------------------------------------------------------------------------
+def TypeCheck(Val):
+  rex_float = r'^\d+\.\d+$'
+  rex_int   = r'^\d+$'
+
+  if type(Val) == int:
+    return('INTEGER')
+  elif(type(Val) == float):
+    return('REAL')
+  else:
+    if type(Val) == str:
+      if match(rex_float, Val):
+        return('REAL')
+      if match(rex_int, Val):
+        return('INTEGER')
+      else:
+        return('TEXT')
+    else:
+      return('TEXT')
+    return(None)
+# ---------------------------------------------------------------------------
+# End TypeCheck()
+# ---------------------------------------------------------------------------
+
+
+# ---------------------------------------------------------------------------
+# Def : ColumnName()
+# Desc: Derives a table column name from a raw column heading.
+#       ex: 'Device:' -> OSW_DEVICE, 'r/s' -> OSW_RPERS, '%util' -> OSW_PCTUTIL
+# Args: 1-Raw column heading (RawName)
+# Retn: Column name
+# ---------------------------------------------------------------------------
+def ColumnName(RawName):
+  col = Prefix + RawName.upper()
+  col = col.replace(':', "")
+  col = col.replace('/', "PER")
+  col = col.replace('%', "PCT")
+  col = col.replace('-', "_")
+  return(col)
+# ---------------------------------------------------------------------------
+# End ColumnName()
+# ---------------------------------------------------------------------------
+
+
+# ---------------------------------------------------------------------------
+# Def : DataDefinition()
+# Desc: Derives the data definition (column names and data types) from an
+#       array of column names and a sample window of the parsed data. The
+#       data types are inferred once here so that the bulk load does no
+#       per-value type checking. A column is INTEGER only if every sampled
+#       value is an integer, REAL if every value is numeric, otherwise TEXT.
+# Args: 1-List of column names from the raw data. For example:
+#         ['file_name', 'os_name', 'name', 'version', 'hostname', ...]
+#       2-List of sample rows (Sample)
+# Retn: Dictionary of data definitions defined as:
+#         data_def[col_id]['raw_name']     = str
+#         data_def[col_id]['column_name']  = str
+#         data_def[col_id]['type']         = str
+#         data_def[col_id]['order']        = str
+#         data_def[col_id]['filter']       = [oper,val]
+# ---------------------------------------------------------------------------
+def DataDefinition(Header, Sample):
+  data_def = {}
+
+  # Determine column data type definitions for the table...
+  for idx, name in enumerate(Header):
+    data_def[idx] = { 'column_name' : ColumnName(name), 'raw_name' : name, 'type' : None, 'order' : None, 'filter' : [None,None] }
+
+  for row in Sample:
+    for key, col in enumerate(row):
+      t = TypeCheck(col)
+      if (data_def[key]['type'] == 'TEXT' or t == 'TEXT'):
+        data_def[key]['type'] = 'TEXT'
+      elif (data_def[key]['type'] == 'REAL' or t == 'REAL'):
+        data_def[key]['type'] = 'REAL'
+      else:
+        data_def[key]['type'] = t
+
+  return(data_def)
+# ---------------------------------------------------------------------------
+# End DataDefinition()
+# ---------------------------------------------------------------------------
+
+
+# ---------------------------------------------------------------------------
+# Def : CreateTable()
+# Desc: Creates a Sqlite table based on an array of column names and
+#       data types derrived from a sample window of the parsed data (see
+#       DataDefinition()).
+# Args: 1-Cursor (Curs)
+#       2-Table name (Table)
+#       3-List of column names from the raw data. For example:
+#         ['file_name', 'os_name', 'name', 'version', 'hostname', ...]
+#       4-List of sample rows (Sample)
+# Retn: Dictionary of data definitions (see DataDefinition())
+# ---------------------------------------------------------------------------
+def CreateTable(Curs, Table, Header, Sample):
+  data_def = DataDefinition(Header, Sample)
+
+  # Assemble the sql statement...
+  col_set = []
+  for key in sorted(data_def) :
+    col_set.append("%-25s%s" % (data_def[key]['column_name'], data_def[key]['type']))
+
+  sql  = 'CREATE TABLE ' + Table + ' (\n   '
+  sql += ',\n   '.join(col_set)
+  sql += '\n);'
+
+  try:
+    Curs.execute(sql)
+  except:
+    print("Cannot create table: %s" % sql)
+    exit(1)
+
+  return(data_def)
+# ---------------------------------------------------------------------------
+# End CreateTable()
+# ---------------------------------------------------------------------------
+
+
+# ---------------------------------------------------------------------------
+# Def : TuneDatabase()
+# Desc: Sets the Sqlite pragmas used for bulk loading. The database is a
+#       throw-away (or rebuilt from the OSWatcher files) so there is no
+#       need for a rollback journal or for syncing writes.
+# Args: 1-Cursor (Curs)
+#       2-Page cache size in KB (CacheKb)
+# Retn: <none>
+# ---------------------------------------------------------------------------
+def TuneDatabase(Curs, CacheKb=262144):
+  Pragmas = [
+    'PRAGMA journal_mode = OFF',
+    'PRAGMA synchronous  = OFF',
+    'PRAGMA temp_store   = MEMORY',
+    'PRAGMA cache_size   = -' + str(CacheKb),
+  ]
+
+  for sql in Pragmas:
+    try:
+      Curs.execute(sql)
+    except:
+      print("Cannot set database option: %s" % sql)
+      exit(1)
+# ---------------------------------------------------------------------------
+# End TuneDatabase()
+# ---------------------------------------------------------------------------
+
+
+# ---------------------------------------------------------------------------
+# Def : InsertSql()
+# Desc: Builds the INSERT statement for a table.
+# Args: 1-Table name (Table)
+#       2-data_def (data definition dictionary) (DataDef)
+# Retn: INSERT statement
+# ---------------------------------------------------------------------------
+def InsertSql(Table, DataDef):
+
+  # Create top half of the SQL insert statement (the top half has the column names).
+  col_names = ",\n   ".join([DataDef[key]['column_name'].upper() for key in sorted(DataDef)])
+
+  # Create bottom half of the SQL insert statement (? placeholder for each data element to insert).
+  col_values = ",\n   ".join(['?' for col in range(len(DataDef.keys()))])
+
+  # Assemble the sql statement...
+  sql   = "INSERT INTO " + Table + " (\n"
+  sql  += "   " + col_names + "\n"
+  sql  += ") VALUES (\n   " + col_values + "\n);"
+
+  return(sql)
+# ---------------------------------------------------------------------------
+# End InsertSql()
+# ---------------------------------------------------------------------------
+
+
+# ---------------------------------------------------------------------------
+# Def : InsertRows()
+# Desc: Inserts data records into a table. The caller owns the
+#       transaction so that all files are loaded in a single transaction.
+# Args: 1-Cursor (Curs)
+#       2-INSERT statement (Sql)
+#       3-two dimensional List of data (Rows)
+# Retn: Number of rows inserted
+# ---------------------------------------------------------------------------
+def InsertRows(Curs, Sql, Rows):
+
+  try:
+    Curs.executemany(Sql, Rows)
+  except:
+    print("Failure occured inserting data: %s" % Sql)
+    exit(1)
+
+  return(len(Rows))
+# ---------------------------------------------------------------------------
+# End InsertRows()
+# ---------------------------------------------------------------------------
+
+
+# ---------------------------------------------------------------------------
+# Def : ParseIostat()
+# Desc: Parses the text of an OSWatcher iostat file (or the part of one that
+#       has been read so far).
+# Args: 1-Name of the file the text came from (file_name)
+#       2-Text to parse (file_contents)
+# Retn: 1-A list of data (stats), 2-A list of header names (header),
+#       3-Hostname found in data set (hostname).
+# ---------------------------------------------------------------------------
+def ParseIostat(file_name, file_contents):
+  header            = ''
+  data              = []
+  nl                = '?:\n|\r\n?'
+  rex_day           = r'Sun|Mon|Tue|Wed|Thu|Fri|Sat'
+  rex_month         = r'Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec'
+  rex_timestamp     = r'^zzz \*\*\*(' + rex_day + ') +(' + rex_month + ') +([0-9]|[0-9][0-9]) +([0-9][0-9]:[0-9][0-9]:[0-9][0-9]) +(\S+) +(\d+)\s*'
+  rex_data1         = r'^\s*avg-cpu: +(%user +%nice +%system +%iowait +%steal +%idle)\s*'
+  rex_data2         = r'^\s*(\d+\.\d+ +\d+\.\d+ +\d+\.\d+ +\d+\.\d+ +\d+\.\d+ +\d+\.\d+)\s*'
+  rex_data3         = r' *(Device: +rrqm\/s +wrqm\/s +r\/s +w\/s +rkB\/s +wkB\/s +avgrq-sz +avgqu-sz +await +r_await +w_await +svctm +\%util)\s*'
+  rex_data4         = r'((?:\S+ +\d+\.\d+ +\d+\.\d+ +\d+\.\d+ +\d+\.\d+ +\d+\.\d+ +\d+\.\d+ +\d+\.\d+ +\d+\.\d+ +\d+\.\d+ +\d+\.\d+ +\d+\.\d+ +\d+\.\d+ +\d+\.\d+\s*)+)'
+  rex_fheader       = compile(r'(^\S+) +(\S+) +(v[0-9].[0-9].[0-9])\s+', MULTILINE)
+  rex_sample        = compile(rex_timestamp + rex_data1 + rex_data2 + rex_data3 + rex_data4, MULTILINE)
+  data_dict         = {}
+  header_pt1        = ['file_name','os_name','name','version','hostname','timestamp','sn','ln']
+  header_pt2        = []
+  hostname          = basename(file_name).split('_')[0]
+
+  # Sample data follows. Note that iostat (rex_data3 lines) are terminated
+  # with "\t\n".
+  # ----------------------------------------------------------------------
+  # Linux OSWbb v7.3.3                                                                                                          <------- rex_fheader
+  # zzz ***Wed Nov 28 14:00:21 CST 2018                                                                                         <---- rex_timestamp
+  # avg-cpu:  %user   %nice %system %iowait  %steal   %idle                                                                     <---- rex_data1
+  #           23.85    0.00    6.40   17.77    0.00   51.99                                                                     <---- rex_data2
+  #                                                                                                                             <---- ???
+  # Device:         rrqm/s   wrqm/s     r/s     w/s    rkB/s    wkB/s avgrq-sz avgqu-sz   await r_await w_await  svctm  %util   <---- rex_data3
+  # sda               0.00     0.00    0.00    1.00     0.00     4.00     8.00     0.00    3.00    0.00    3.00   3.00   0.30   <---- rex_data4
+  # sdc               0.00     0.00    0.00    0.00     0.00     0.00     0.00     0.00    0.00    0.00    0.00   0.00   0.00   <---- rex_data4
+  # ...
+  # dm-8              0.00     0.00    0.00    0.00     0.00     0.00     0.00     0.00    0.00    0.00    0.00   0.00   0.00   <---- rex_data4
+  # dm-9              0.00     0.00    0.00    1.00     0.00     4.00     8.00     0.00    3.00    0.00    3.00   3.00   0.30   <---- rex_data4
+  #
+  # zzz ***Wed Nov 28 14:00:51 CST 2018
+  # avg-cpu:  %user   %nice %system %iowait  %steal   %idle
+  #           22.15    0.00    6.06   17.70    0.00   54.09
+  #
+  # Device:         rrqm/s   wrqm/s     r/s     w/s    rkB/s    wkB/s avgrq-sz avgqu-sz   await r_await w_await  svctm  %util
+  # sda               0.00     0.00    0.00    0.00     0.00     0.00     0.00     0.00    0.00    0.00    0.00   0.00   0.00
+  # sdc               0.00     0.00    0.00    0.00     0.00     0.00     0.00     0.00    0.00    0.00    0.00   0.00   0.00
+  # sdd               0.00     0.00    0.00    0.00     0.00     0.00     0.00     0.00    0.00    0.00    0.00   0.00   0.00
+  # sde               0.00     0.00    0.00    0.00     0.00     0.00     0.00     0.00    0.00    0.00    0.00   0.00   0.00
+  # sdg               0.00     0.00  613.00    7.00  4904.00    56.00    16.00     0.39    0.63    0.63    0.43   0.52  32.50
+  # ...
+
+  # Need to organize and store data for each iostat collection. That is, all data from
+  # one header record to the next header record. The start position of the data is given
+  # but we must ascertain the ending position (defined as the last character before the
+  # start of the next header record (or EOF). We will then extract the data between
+  # start and end and store it in the 'data' key of the dictionary.
+  # --------------------------------------------------------------------------------------
+  header_set = [ h for h in rex_fheader.finditer(file_contents) ]
+  i = 1
+  for h in header_set:
+    if (h):
+      data_dict[i] = {
+         'header_start'  : h.start(),
+         'header_end'    : h.end(),
+         'header_groups' : h.groups(),
+         'start'         : h.end(),
+         'end'           : -1,
+         'data'          : '',
+      }
+
+      # Must calculate the end pos of the data body as  next header_start-1
+      if i > 1 :
+        data_dict[i-1]['end']  = (data_dict[i]['header_start']-1)
+        data_dict[i-1]['data'] = file_contents[data_dict[i-1]['start']:data_dict[i-1]['end']]
+      i += 1
+    data_dict[i-1]['end']  = (len(file_contents))
+    data_dict[i-1]['data'] = file_contents[data_dict[i-1]['start']:len(file_contents)]
+
+  for key in sorted(data_dict):
+    sn = 0
+
+    # Formulate the output header from iostat output headers...
+    # Expecting:
+    #   ('Linux', 'OSWbb', 'v7.3.3')
+    # ------------------------------------------------------------------------------------------------
+    os_name, name, version = data_dict[key]['header_groups']
+
+    # Now, finally, search for iostat samples in each set of data and load up the
+    # data, header, and hostname variables we will be returning.
+    # ----------------------------------------------------------------------------
+    for sample_set in rex_sample.finditer(data_dict[key]['data']):
+      sn += 1
+      # Each sample_set should look something like ...
+      # -------------------------------------------------------------------------------------------------------------
+      # Expecting Something Like:
+      #
+      # sample_set.groups()[0]  : Sat
+      # sample_set.groups()[1]  : Dec
+      # sample_set.groups()[2]  : 8
+      # sample_set.groups()[3]  : 15:00:11
+      # sample_set.groups()[4]  : CST
+      # sample_set.groups()[5]  : 2018
+      # sample_set.groups()[6]  : avg-cpu:  %user   %nice %system %iowait  %steal   %idle
+      # sample_set.groups()[7]  : 16.87    0.00   18.89    3.13    0.00   61.11
+      # sample_set.groups()[8]  : Device:         rrqm/s   wrqm/s     r/s     w/s    rkB/s    wkB/s avgrq-sz avgqu-sz   await r_await w_await  svctm  %util
+      # sample_set.groups()[9]  : sdb               0.00     0.00   26.00    0.00   872.00     0.00    67.08     0.01    0.50    0.50    0.00   0.38   1.00
+      #                           sdf               0.00     0.00  124.00    0.00  3056.00     0.00    49.29     0.09    0.76    0.76    0.00   0.76   9.40
+      #                           sdc               0.00     0.00    0.00   21.00     0.00   123.50    11.76     0.02    0.86    0.00    0.86   0.86   1.80
+      #                           sdd               0.00     0.00    0.00    0.00     0.00     0.00     0.00     0.00    0.00    0.00    0.00   0.00   0.00
+      #                           sde               0.00     0.00   14.00   22.00   284.00   139.50    23.53     0.04    1.00    1.00    1.00   1.00   3.60
+      #                           sdg               0.00     0.00   40.00    2.00  1072.00    32.00    52.57     0.03    0.81    0.80    1.00   0.81   3.40
+      # -------------------------------------------------------------------------------------------------------------
+      #    *** the ones we're interested in...
+      dname         = sample_set.groups()[0]
+      mname         = sample_set.groups()[1]
+      sample_day    = sample_set.groups()[2]
+      sample_time   = sample_set.groups()[3]
+      sample_tz     = sample_set.groups()[4]
+      sample_year   = sample_set.groups()[5]
+      sample_h1     = sample_set.groups()[6].strip().split()
+      sample_data1  = sample_set.groups()[7].strip().split()
+      sample_h2     = sample_set.groups()[8].strip().split()
+      sample_data2  = sample_set.groups()[9].strip().split('\n')
+
+      # Convert values from string to float
+      sample_data1 = [ float(val) for val in sample_data1 ]
+
+      # Convert sample data into a two dimensional List (like a table of rows & columns.
+      sample_data2 = [ rec.split() for rec in sample_data2 ]
+
+      timestamp = sample_year + '-' + MonthMap[mname] + '-' + sample_day.zfill(2) + ' ' + sample_time
+
+      # Formulate a list of column names...
+      # avg-cpu: %user %nice %system %iowait %steal %idlec Device: rrqm/s wrqm/s r/s w/s rkB/s wkB/s avgrq-sz avgqu-sz await r_await w_await svctm %util
+      header_pt2 = sample_h1 + sample_h2
+
+      # Formulate the metadata portion of the record...
+      metadata = [
+        basename(file_name),
+        os_name,
+        name,
+        version,
+        hostname,
+        timestamp,
+      ]
+
+      ln = 0
+      ts = metadata[5]    # TimeStamp
+      for rec in sample_data2:
+        ln += 1
+        for index, item in enumerate(rec):
+          if index > 0:
+            rec[index] = float(item)
+        data.append(metadata + [sn] + [ln] + sample_data1 + rec)
+
+    header = header_pt1 + header_pt2
+
+  return(data, header, hostname)
+# ---------------------------------------------------------------------------
+# End ParseIostat()
+# ---------------------------------------------------------------------------
+
+
+# ---------------------------------------------------------------------------
+# Def : ParseVmstat()
+# Desc: Parses the text of an OSWatcher vmstat file (or the part of one that
+#       has been read so far).
+# Args: 1-Name of the file the text came from (file_name)
+#       2-Text to parse (file_contents)
+# Retn: 1-A list of data (stats), 2-A list of header names (header),
+#       3-Hostname found in data set (hostname).
+# ---------------------------------------------------------------------------
+def ParseVmstat(file_name, file_contents):
+  header            = ''
+  data              = []
+  nl                = '?:\n|\r\n?'
+  rex_day           = r'Sun|Mon|Tue|Wed|Thu|Fri|Sat'
+  rex_month         = r'Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec'
+  rex_timestamp     = r'^zzz \*\*\*(' + rex_day + ') +(' + rex_month + ') +([0-9]|[0-9][0-9]) +([0-9][0-9]:[0-9][0-9]:[0-9][0-9]) +(\S+) +(\d+)\s*'
+  rex_data1         = r'(procs -+memory-+ -+swap-+ -+io-+ -+system-+ -+cpu-+)\s*'
+  rex_data2         = r' +(r +b +swpd +free +buff +cache +si +so +bi +bo +in +cs us +sy +id +wa +st)\s*'
+  rex_data3         = r'((?: *\d+ +\d+ +\d+ +\d+ +\d+ +\d+ +\d+ +\d+ +\d+ +\d+ +\d+ +\d+ +\d+ +\d+ +\d+ +\d+ +\d+\s*)+)'
+  rex_fheader       = compile(r'(^\S+) (\S+) (v[0-9].[0-9].[0-9]) (.*)('+nl+')\S+ (\d+)('+nl+')\S+ (\d+)('+nl+')\S+ (\S+)('+nl+')', MULTILINE)
+  rex_sample        = compile(rex_timestamp + rex_data1 + rex_data2 + rex_data3, MULTILINE)
+  data_dict          = {}
+  header_pt1        = ['file_name','os_name','name','version','location','hostname','timestamp','int','cpu','sn','ln']
+  header_pt2        = []
+  hostname          = ''
+
+  # Sample data follows. Note that vmstat (rex_data3 lines) are terminated
+  # with "\t\n".
+  # ----------------------------------------------------------------------
+  # Linux OSWbb v7.3.3 tmprracsapl01                                                       <------- rex_fheader
+  # SNAP_INTERVAL 30                                                                       <---|
+  # CPU_COUNT 16                                                                           <---|
+  # OSWBB_ARCHIVE_DEST /oracle/OSWATCHER/oswbb/archive                                     <---+
+  # zzz ***Sun May 7 01:00:18 CDT 2017                                                     <---- rex_timestamp ---- rex_sample
+  # procs -----------memory---------- ---swap-- -----io---- --system-- -----cpu-----       <---- rex_data1 ------|
+  #  r  b   swpd   free   buff  cache   si   so    bi    bo   in   cs us sy id wa st       <---- rex_data2 ------|
+  #  9  0      0 16472328 792036 4571600    0    0 16399  5338   19    2 21  7 62 10  0    <---- rex_data3 ------|
+  #  4  2      0 16454068 792036 4572012    0    0  8956 51502 43647 49349 24  9 63  4  0  <---- rex_data3 ------|
+  #  5  2      0 16448796 792036 4572256    0    0 15249 175833 37367 48100 18  4 72  7  0 <---- rex_data3 ------+
+  # zzz ***Sun May 7 01:02:19 CDT 2017
+  # procs -----------memory---------- ---swap-- -----io---- --system-- -----cpu-----
+  #  r  b   swpd   free   buff  cache   si   so    bi    bo   in   cs us sy id wa st
+  #  4  2      0 16909796 792104 4574004    0    0 16390  5337    2    4 21  7 62 10  0
+  #  2  0      0 16905140 792104 4574232    0    0 163562  3094 41544 51730 10  7 76  7  0
+  #  1  3      0 16904396 792104 4574624    0    0 29507 11412 36507 49399  9  3 82  5  0
+  # Linux OSWbb v7.3.3 tmprracsapl01
+  # SNAP_INTERVAL 30
+  # CPU_COUNT 16
+  # OSWBB_ARCHIVE_DEST /oracle/OSWATCHER/oswbb/archive
+  # zzz ***Sun May 7 01:53:40 CDT 2017
+  # procs -----------memory---------- ---swap-- -----io---- --system-- -----cpu-----
+  #  r  b   swpd   free   buff  cache   si   so    bi    bo   in   cs us sy id wa st
+  #  3  1      0 50326632 220188 1049544    0    0   571    24  375  287  5  1 90  3  0
+  #  1  0      0 50274400 220248 1049920    0    0   105    37 9253 9493  9  2 88  0  0
+  #  1  0      0 50228608 220248 1050060    0    0     1     0 6742 7558 12  1 87  0  0
+  # zzz ***Sun May 7 01:54:40 CDT 2017
+  # procs -----------memory---------- ---swap-- -----io---- --system-- -----cpu-----
+  #  r  b   swpd   free   buff  cache   si   so    bi    bo   in   cs us sy id wa st
+  #  6  1      0 47750224 226124 1876740    0    0   841    36  472  424  5  2 90  3  0
+  #  1  1      0 47644088 226152 1893588    0    0 31184   705 27683 33300 10  7 82  1  0
+  #  1  0      0 47564608 226168 1910480    0    0 34631   776 25389 30957 12  4 83  1  0
+  # zzz ***Sun May 7 01:59:40 CDT 2017
+  # procs -----------memory---------- ---swap-- -----io---- --system-- -----cpu-----
+  #  r  b   swpd   free   buff  cache   si   so    bi    bo   in   cs us sy id wa st
+  # 10  0      0 41444864 272684 2936656    0    0  2923  1118 1515 2044 10  3 83  4  0
+  #  2  1      0 41508040 272692 2936828    0    0  8104   591 38658 55135 10  7 80  2  0
+  #  0  0      0 41524204 272692 2936668    0    0  7683   663 36595 55242  6  4 88  2  0
+
+  # Need to organize and store data for each vmstat collection. That is, all data from
+  # one header record to the next header record. The start position of the data is given
+  # but we must ascertain the ending position (defined as the last character before the
+  # start of the next header record (or EOF). We will then extract the data between
+  # start and end and store it in the 'data' key of the dictionary.
+  # --------------------------------------------------------------------------------------
+  header_set = [ h for h in rex_fheader.finditer(file_contents) ]
+  i = 1
+  for h in header_set:
+    if (h):
+      data_dict[i] = {
+         'header_start'  : h.start(),
+         'header_end'    : h.end(),
+         'header_groups' : h.groups(),
+         'start'         : h.end(),
+         'end'           : -1,
+         'data'          : '',
+      }
+      # Must calculate the end pos of the data body as  next header_start-1
+      if i > 1 :
+        data_dict[i-1]['end']  = (data_dict[i]['header_start']-1)
+        data_dict[i-1]['data'] = file_contents[data_dict[i-1]['start']:data_dict[i-1]['end']]
+      i += 1
+    data_dict[i-1]['end']  = (len(file_contents))
+    data_dict[i-1]['data'] = file_contents[data_dict[i-1]['start']:len(file_contents)]
+
+  for key in sorted(data_dict):
+    sn = 0
+
+    # Formulate the output header from vmstat output headers...
+    # Expecting:
+    #   ('Linux', 'OSWbb', 'v7.3.3', 'tmprracsapl01', '30', '16', '/oracle/OSWATCHER/oswbb/archive')
+    # ------------------------------------------------------------------------------------------------
+    os_name, name, version, hostname, snap_int, cpu_count, location = data_dict[key]['header_groups']
+
+    # Convert snap_int to integer...
+    try:
+      snap_int  = int(snap_int)
+    except:
+      raise ParseError("Invalid value for snapshot interval in file: %s\nExpected integer but found: %s" % (file_name, type(snap_int)))
+
+    # Convert cpu_count to integer...
+    try:
+      cpu_count = int(cpu_count)
+    except:
+      raise ParseError("Invalid value for cpu count in file: %s\nExpected integer but found: %s" % (file_name, type(cpu_count)))
+
+    # Now, finally, search for vmstat samples in each set of data and load up the
+    # data, header, and hostname variables we will be returning.
+    # ----------------------------------------------------------------------------
+    for sample_set in rex_sample.finditer(data_dict[key]['data']):
+      sn += 1
+      # Each sample_set should look something like ...
+      # -------------------------------------------------------------------------------------------------------------
+      # Expecting Something Like:
+      #
+      #  *** sample_set.groups()[0]   : 'Sun'
+      #  *** sample_set.groups()[1]   : 'May'
+      #  *** sample_set.groups()[2]   : '7'
+      #  *** sample_set.groups()[3]   : '01:00:18'
+      #  *** sample_set.groups()[4]   : 'CDT'
+      #  *** sample_set.groups()[5]   : '2017'
+      #      sample_set.groups()[6]   : 'procs -----------memory---------- ---swap-- -----io---- --system-- -----cpu-----'
+      #      sample_set.groups()[7]   : 'r  b   swpd   free   buff  cache   si   so    bi    bo   in   cs us sy id wa st'
+      #      sample_set.groups()[8]   : '9  0      0 16472328 792036 4571600    0    0 16399  5338   19    2 21  7 62 10  0\t\n'
+      #                               : '4  2      0 16454068 792036 4572012    0    0  8956 51502 43647 49349 24  9 63  4  0\t\n'
+      #                               : '5  2      0 16448796 792036 4572256    0    0 15249 175833 37367 48100 18  4 72  7  0\t\n'
+      # -------------------------------------------------------------------------------------------------------------
+      #    *** the ones we're interested in...
+      dname         = sample_set.groups()[0]
+      mname         = sample_set.groups()[1]
+      sample_day    = sample_set.groups()[2]
+      sample_time   = sample_set.groups()[3]
+      sample_tz     = sample_set.groups()[4]
+      sample_year   = sample_set.groups()[5]
+      sample_data   = sample_set.groups()[8].strip().split('\t\n')
+
+      # Convert sample data into a two dimensional List (like a table of rows & columns.
+      sample_data = [ rec.split() for rec in sample_data ]
+
+      timestamp = sample_year + '-' + MonthMap[mname] + '-' + sample_day.zfill(2) + ' ' + sample_time
+
+      # Formulate a list of column names...
+      # 'r  b   swpd   free   buff  cache   si   so    bi    bo   in   cs us sy id wa st'
+      header_pt2 = sample_set.groups()[7].split()
+
+      # Formulate the metadata portion of the record...
+      metadata = [
+        basename(file_name),
+        os_name,
+        name,
+        version,
+        location,
+        hostname,
+        timestamp,
+        snap_int,
+        cpu_count,
+      ]
+
+      ln = 0
+      sec = 0
+      ts = metadata[6]    # TimeStamp
+      for rec in sample_data[1:3]:  # we only want lines 2-3 since the first line is an average since boot.
+        ln += 1
+        metadata[6] = ts + '.' + str(sec)    # metadata[6] is the timestamp
+        sec += 1
+        rec = [ int(x) for x in rec ]        # convert all elements of rec to integer...
+        data.append(metadata + [sn] + [ln] + rec)
+
+    header = header_pt1 + header_pt2
+
+  return(data, header, hostname)
+# ---------------------------------------------------------------------------
+# End ParseVmstat()
+# ---------------------------------------------------------------------------
+
+
+# ---------------------------------------------------------------------------
+# Def : ParsePs()
+# Desc: Parses the text of an OSWatcher ps file (or the part of one that
+#       has been read so far).
+# Args: 1-Name of the file the text came from (file_name)
+#       2-Text to parse (file_contents)
+# Retn: 1-A list of data (stats), 2-A list of header names (header),
+#       3-Hostname found in data set (hostname).
+# ---------------------------------------------------------------------------
+def ParsePs(file_name, file_contents):
+  header            = ''
+  data              = []
+  nl                = '?:\n|\r\n?'
+  rex_day           = r'Sun|Mon|Tue|Wed|Thu|Fri|Sat'
+  rex_month         = r'Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec'
+  rex_timestamp     = r'^zzz \*\*\*(' + rex_day + ') +(' + rex_month + ') +([0-9]|[0-9][0-9]) +([0-9][0-9]:[0-9][0-9]:[0-9][0-9]) +(\S+) +(\d+)\s*'
+  rex_data1         = r'(USER +PID +PPID +PRI \%CPU +\%MEM +VSZ +RSS +WCHAN +S +STARTED +TIME +COMMAND)\s*'
+  rex_data2         = r'((?:\w+ +\d+ +\d+ +\d+ +\d+\.\d+ +\d+\.\d+ +\S+ +\d+ +\S+ +\S +(?:(Jan [0-9][0-9]|Feb [0-9][0-9]|Mar [0-9][0-9]|Apr [0-9][0-9]|May [0-9][0-9]|Jun [0-9][0-9]|Jul [0-9][0-9]|Aug [0-9][0-9]|Sep [0-9][0-9]|Oct [0-9][0-9]|Nov [0-9][0-9]|Dec [0-9][0-9]|[0-9][0-9]:[0-9][0-9]:[0-9][0-9])) +(?:(\d+-)*)[0-9][0-9]:[0-9][0-9]:[0-9][0-9] +\S+.*\n)+)'
+  rex_fheader       = compile(r'(^\S+) (\S+) (v[0-9].[0-9].[0-9])\s*('+nl+')', MULTILINE)
+  rex_sample        = compile(rex_timestamp + rex_data1 + rex_data2, MULTILINE)
+  data_dict         = {}
+  header_pt1        = ['file_name','os_name','name','version','hostname','timestamp','sn','ln']
+  header_pt2        = []
+  hostname          = basename(file_name).split('_')[0]
+
+  # Sample data follows.
+  # ----------------------------------------------------------------------
+  # Linux OSWbb v7.3.3                                                                                    <------- rex_fheader
+  #
+  # zzz ***Mon Dec 10 14:00:26 CST 2018                                                                   <---- rex_timestamp --+- rex_sample
+  # USER       PID  PPID PRI %CPU %MEM    VSZ   RSS WCHAN  S  STARTED     TIME COMMAND                    <---- rex_data1 ------+
+  # root      4280     1  19 81.1  0.5 1736828 377372 ep_pol S   Dec 08 1-15:51:56 splunkd -p 8089 start  <---- rex_data2 ------+
+  # oracle   61933     1  19 25.5  0.3 457792 232740 -     R   Dec 09 06:42:25 oracleLPMXPRD1 (LOCAL=NO)
+  # oracle   55411     1  19 21.8  0.3 474160 232428 -     R 09:29:35 00:59:12 oracleLPMXPRD1 (LOCAL=NO)
+  # oracle   40968     1  19 25.9  0.3 457536 231344 sys_se S   Dec 09 06:52:35 oracleLPMXPRD1 (LOCAL=NO)
+  # oracle   36363     1  19 22.4  0.3 473920 234444 -     R 10:09:34 00:51:47 oracleLPMXPRD1 (LOCAL=NO)
+  # oracle   34892     1  19 21.6  0.3 457536 229228 -     R 09:09:34 01:02:56 oracleLPMXPRD1 (LOCAL=NO)
+
+  # Need to organize and store data for each ps collection. That is, all data from
+  # one header record to the next header record. The start position of the data is given
+  # but we must ascertain the ending position (defined as the last character before the
+  # start of the next header record (or EOF). We will then extract the data between
+  # start and end and store it in the 'data' key of the dictionary.
+  # --------------------------------------------------------------------------------------
+  header_set = [ h for h in rex_fheader.finditer(file_contents) ]
+  i = 1
+  for h in header_set:
+    if (h):
+      data_dict[i] = {
+         'header_start'  : h.start(),
+         'header_end'    : h.end(),
+         'header_groups' : h.groups(),
+         'start'         : h.end(),
+         'end'           : -1,
+         'data'          : '',
+      }
+      # Must calculate the end pos of the data body as  next header_start-1
+      if i > 1 :
+        data_dict[i-1]['end']  = (data_dict[i]['header_start']-1)
+        data_dict[i-1]['data'] = file_contents[data_dict[i-1]['start']:data_dict[i-1]['end']]
+      i += 1
+    data_dict[i-1]['end']  = (len(file_contents))
+    data_dict[i-1]['data'] = file_contents[data_dict[i-1]['start']:len(file_contents)]
+
+  for key in sorted(data_dict):
+    sn = 0
+
+    # Formulate the output header from ps output headers...
+    # Expecting:
+    #   ('Linux', 'OSWbb', 'v7.3.3')
+    # ------------------------------------------------------------------------------------------------
+    os_name, name, version = data_dict[key]['header_groups']
+
+    # Now, finally, search for ps samples in each set of data and load up the
+    # data, header, and hostname variables we will be returning.
+    # ----------------------------------------------------------------------------
+    for sample_set in rex_sample.finditer(data_dict[key]['data']):
+      sn += 1
+      # Each sample_set should look something like ...
+      # -------------------------------------------------------------------------------------------------------------
+
+      # sample_set.groups()[0]  : Mon
+      # sample_set.groups()[1]  : Dec
+      # sample_set.groups()[2]  : 10
+      # sample_set.groups()[3]  : 13:00:16
+      # sample_set.groups()[4]  : CST
+      # sample_set.groups()[5]  : 2018
+      # sample_set.groups()[6]  : USER       PID  PPID PRI %CPU %MEM    VSZ   RSS WCHAN  S  STARTED     TIME COMMAND
+      # sample_set.groups()[7]  : root      4280     1  19 81.1  0.5 1734780 336540 ep_pol S   Dec 08 1-15:03:32 splunkd -p 8089 start
+      #                           oracle    7426     1 139  0.8  0.3 1973308 215724 futex_ S   Dec 08 00:24:07 /u01/app/12.1.0.2/grid/bin/ocssd.bin
+      #                           oracle   43820     1  19  0.8  0.2 408924 172448 poll_s S   Dec 09 00:16:06 oracleLPMXPRD1 (LOCAL=NO)
+      #                           root     10762     1 139  2.8  0.1 1086472 121684 hrtime S   Dec 08 01:21:01 /u01/app/12.1.0.2/grid/bin/osysmond.bin
+      #                           root      7401     1 139  0.2  0.1 1016168 116496 futex_ S   Dec 08 00:07:51 /u01/app/12.1.0.2/grid/bin/cssdagent
+      #                           root      7378     1 139  0.2  0.1 1083048 118100 futex_ S   Dec 08 00:07:37 /u01/app/12.1.0.2/grid/bin/cssdmonitor
+      # -------------------------------------------------------------------------------------------------------------
+      #    *** the ones we're interested in...
+      dname         = sample_set.groups()[0]
+      mname         = sample_set.groups()[1]
+      sample_day    = sample_set.groups()[2]
+      sample_time   = sample_set.groups()[3]
+      sample_tz     = sample_set.groups()[4]
+      sample_year   = sample_set.groups()[5]
+      sample_header = sample_set.groups()[6].strip().lower().split()
+      sample_data   = sample_set.groups()[7]
+      sample_header.append('cmd')
+
+      # Convert sample data into a two dimensional List (like a table of rows & columns.
+      rex_data = r'(\w+) +(\d+) +(\d+) +(\d+) +(\d+\.\d+) +(\d+\.\d)+ +(\S+) +(\d+) +(\S+) +(\S) +(Jan [0-9][0-9]|Feb [0-9][0-9]|Mar [0-9][0-9]|Apr [0-9][0-9]|May [0-9][0-9]|Jun [0-9][0-9]|Jul [0-9][0-9]|Aug [0-9][0-9]|Sep [0-9][0-9]|Oct [0-9][0-9]|Nov [0-9][0-9]|Dec [0-9][0-9]|[0-9][0-9]:[0-9][0-9]:[0-9][0-9]) +((?:\d+-)?[0-9][0-9]:[0-9][0-9]:[0-9][0-9]) +(\S+.*)\n'
+      sample_data2 = []
+      for row in list(finditer(rex_data, sample_data)):
+        row = list(row.groups())
+        try:
+          row[1] = int(row[1])
+        except:
+          pass
+        try:
+          row[2] = int(row[2])
+        except:
+          pass
+        try:
+          row[3] = int(row[3])
+        except:
+          pass
+        try:
+          row[4] = float(row[4])
+        except:
+          pass
+        try:
+          row[5] = float(row[5])
+        except:
+          pass
+        try:
+          row[6] = int(row[6])
+        except:
+          pass
+        try:
+          row[7] = int(row[7])
+        except:
+          pass
+        # Add a custom column called cmd that is a substring of command.
+        row.append(row[12][0:50])
+        sample_data2.append(row)
+
+      timestamp = sample_year + '-' + MonthMap[mname] + '-' + sample_day.zfill(2) + ' ' + sample_time
+
+      # Formulate the metadata portion of the record...
+      metadata = [
+        basename(file_name),
+        os_name,
+        name,
+        version,
+        hostname,
+        timestamp,
+      ]
+
+      ln = 0
+      ts = metadata[5]    # TimeStamp
+      for rec in sample_data2:
+        ln += 1
+        data.append(metadata + [sn] + [ln] + rec)
+    header = header_pt1 + sample_header
+  return(data, header, hostname)
+# ---------------------------------------------------------------------------
+# End ParsePs()
+# ---------------------------------------------------------------------------
+
+
+# ---------------------------------------------------------------------------
+# Parser registry: file type (from the file name) -> parser function.
+# ---------------------------------------------------------------------------
+Parsers = {
+  'iostat' : ParseIostat,
+  'vmstat' : ParseVmstat,
+  'ps'     : ParsePs,
+}
+
+
+# ---------------------------------------------------------------------------
+# Def : RegisterParser()
+# Desc: Adds (or replaces) the parser for an OSWatcher file type.
+# Args: 1-File type as found in the file name, ex: 'top' (FileType)
+#       2-Parser function(file_name, file_contents) returning
+#         (data, header, hostname) (Parser)
+# Retn: <none>
+# ---------------------------------------------------------------------------
+def RegisterParser(FileType, Parser):
+  Parsers[FileType] = Parser
+# ---------------------------------------------------------------------------
+# End RegisterParser()
+# ---------------------------------------------------------------------------
+
+
+# ---------------------------------------------------------------------------
+# Def : ParseFile()
+# Desc: Reads an OSWatcher file and parses it with the parser registered
+#       for its type.
+# Args: 1-Name of file to parse (FileName)
+#       2-File type, defaults to the type in the file name (FileType)
+# Retn: 1-A list of data (stats), 2-A list of header names (header),
+#       3-Hostname found in data set (hostname). Raises ParseError when
+#       the file cannot be parsed.
+# ---------------------------------------------------------------------------
+def ParseFile(FileName, FileType=''):
+  if (FileType == ''):
+    FileType = basename(FileName).split('_')[-2]
+
+  if (FileType not in Parsers):
+    raise ParseError("No parser registered for file type %s: %s" % (FileType, FileName))
+
+  try:
+    f = open(FileName, 'r+')
+  except:
+    raise ParseError("Cannot open file for read: %s" % FileName)
+
+  # Load the file and close it...
+  FileContents = f.read()
+  f.close()
+
+  return(Parsers[FileType](FileName, FileContents))
+# ---------------------------------------------------------------------------
+# End ParseFile()
+# ---------------------------------------------------------------------------
+
+
+# ---------------------------------------------------------------------------
+# Def : ParseFiles()
+# Desc: Parses a list of files, in order. With more than one worker the
+#       files are parsed by a pool of processes. A parse error is printed
+#       here, in the calling process, and ends the program (a worker
+#       process cannot exit the program for the caller).
+# Args: 1-List of files to parse (FileList)
+#       2-Number of parser processes (Workers)
+#       3-Parse function, one file name in, (data, header, hostname)
+#         out (Parse)
+# Retn: Iterator of (data, header, hostname), one per file.
+# ---------------------------------------------------------------------------
+def ParseFiles(FileList, Workers=1, Parse=ParseFile):
+  pool = None
+
+  if (Workers > 1):
+    pool = Pool(Workers)
+    Parsed = pool.imap(Parse, FileList)
+  else:
+    Parsed = (Parse(FileName) for FileName in FileList)
+
+  try:
+    for Result in Parsed:
+      yield Result
+  except ParseError as e:
+    if (pool is not None):
+      pool.terminate()
+    print("\n%s" % e)
+    exit(1)
+
+  if (pool is not None):
+    pool.close()
+    pool.join()
+# ---------------------------------------------------------------------------
+# End ParseFiles()
+# ---------------------------------------------------------------------------
+
+
+# ---------------------------------------------------------------------------
+# Def : Epoch()
+# Desc: Converts a parsed timestamp (YYYY-MM-DD HH24:MI:SS[.N]) to epoch
+#       seconds. The .N suffix (vmstat line within a sample) is added as
+#       seconds. Timestamps are taken as-is (host local time), so values
+#       from different types on the same host line up.
+# Args: 1-Timestamp (Timestamp)
+# Retn: Epoch seconds (int)
+# ---------------------------------------------------------------------------
+def Epoch(Timestamp):
+  Seconds = timegm(strptime(Timestamp[:19], '%Y-%m-%d %H:%M:%S'))
+  if (len(Timestamp) > 20):
+    Seconds += int(Timestamp[20:])
+  return(Seconds)
+# ---------------------------------------------------------------------------
+# End Epoch()
+# ---------------------------------------------------------------------------
+
+
+# ---------------------------------------------------------------------------
+# Def : StoreTable()
+# Desc: Name of the table holding a file type in the combined store.
+# Args: 1-File type (FileType)
+# Retn: Table name, ex: OSW_IOSTAT
+# ---------------------------------------------------------------------------
+def StoreTable(FileType):
+  return(Prefix + FileType.upper())
+# ---------------------------------------------------------------------------
+# End StoreTable()
+# ---------------------------------------------------------------------------
+
+
+# ---------------------------------------------------------------------------
+# Def : LoadStore()
+# Desc: Parses every file in FileDict and loads each file type into its
+#       own table of one Sqlite store (see StoreTable()). Every table gets
+#       an extra OSW_EPOCH column (see Epoch()) and an index on
+#       (OSW_HOSTNAME, OSW_EPOCH) so samples of different types can be
+#       correlated by host and time. Files are parsed by a pool of
+#       Workers processes and loaded in one transaction, indexes are built
+#       after the load.
+# Args: 1-Cursor (Curs)
+#       2-Dictionary of files from InputFiles() (FileDict)
+#       3-Number of parser processes (Workers)
+#       4-Print each file as it is loaded (Verbose)
+#       5-Rows used to infer the column types (SampleSize)
+# Retn: Dictionary by file type of:
+#         {'table', 'data_def', 'files', 'rows', 'hosts'}
+# ---------------------------------------------------------------------------
+def LoadStore(Curs, FileDict, Workers=1, Verbose=False, SampleSize=1000):
+  Store    = {}
+  FileList = sorted(FileDict, key=lambda FileName: (FileDict[FileName]['type'], FileDict[FileName]['host'], FileDict[FileName]['name']))
+
+  Curs.execute('BEGIN')
+  for idx, (stats, header, hostname) in enumerate(ParseFiles(FileList, Workers)):
+    FileName = FileList[idx]
+    FileType = FileDict[FileName]['type']
+    if (Verbose):
+      print("Parsing file: %s" % FileName)
+    if (not stats):
+      continue
+
+    # Create the table for the first file of each type...
+    if (FileType not in Store):
+      Table   = StoreTable(FileType)
+      DataDef = CreateTable(Curs, Table, header + ['epoch'], [ row + [0] for row in stats[:SampleSize] ])
+      Store[FileType] = {
+        'table'    : Table,
+        'data_def' : DataDef,
+        'sql'      : InsertSql(Table, DataDef),
+        'ts_col'   : header.index('timestamp'),
+        'files'    : 0,
+        'rows'     : 0,
+        'hosts'    : set(),
+      }
+
+    # Add the epoch seconds, most rows of a sample share a timestamp.
+    Entry  = Store[FileType]
+    TsCol  = Entry['ts_col']
+    Cache  = {}
+    Rows   = []
+    for row in stats:
+      ts = row[TsCol]
+      if (ts not in Cache):
+        Cache[ts] = Epoch(ts)
+      Rows.append(row + [Cache[ts]])
+
+    Entry['rows']  += InsertRows(Curs, Entry['sql'], Rows)
+    Entry['files'] += 1
+    Entry['hosts'].add(hostname)
+
+  try:
+    Curs.execute('COMMIT')
+  except:
+    print("Failure occured commiting inserted data.")
+    exit(1)
+
+  # Indexes for correlating the types by host and time...
+  for FileType in Store:
+    Table = Store[FileType]['table']
+    sql = 'CREATE INDEX ' + Table + '_IX_HOST_EPOCH ON ' + Table + ' (' + Prefix + 'HOSTNAME, ' + Prefix + 'EPOCH);'
+    try:
+      Curs.execute(sql)
+    except:
+      print("Cannot create index: %s" % sql)
+      exit(1)
+    del Store[FileType]['sql']
+  if (not InMemory(Curs)):
+    Curs.execute('ANALYZE;')
+
+  return(Store)
+# ---------------------------------------------------------------------------
+# End LoadStore()
+# ---------------------------------------------------------------------------
+
+
+# ---------------------------------------------------------------------------
+# Baseline metrics by file type: (key column, [metrics]). The key column
+# splits a host's samples into separate baselines (one per device for
+# iostat), '' means one baseline per host.
+# ---------------------------------------------------------------------------
+BaselineMetrics = {
+  'iostat' : ('Device:', ['await', '%util', 'r/s', 'w/s']),
+  'vmstat' : ('',        ['r', 'b', 'wa', 'free', 'si', 'so']),
+}
+
+
+# ---------------------------------------------------------------------------
+# Def : OpenBaseline()
+# Desc: Opens (creating it if needed) the Sqlite file holding the anomaly
+#       baselines. Tables:
+#         OSW_BASELINE       count and exponentially weighted mean/variance
+#                            per host, file type, key, metric and hour of
+#                            the week (0-167, Monday 00:00 = 0).
+#         OSW_BASELINE_MARK  last window folded in per host and file type.
+#         OSW_BASELINE_FILES files already scanned (name and size).
+# Args: 1-Baseline file name (FileName)
+# Retn: Sqlite connection
+# ---------------------------------------------------------------------------
+def OpenBaseline(FileName):
+  Tables = [
+    'CREATE TABLE IF NOT EXISTS OSW_BASELINE (HOSTNAME TEXT, TYPE TEXT, KEY TEXT, METRIC TEXT, HOW INTEGER, N INTEGER, MEAN REAL, VAR REAL, PRIMARY KEY (HOSTNAME, TYPE, KEY, METRIC, HOW));',
+    'CREATE TABLE IF NOT EXISTS OSW_BASELINE_MARK (HOSTNAME TEXT, TYPE TEXT, WINDOW INTEGER, PRIMARY KEY (HOSTNAME, TYPE));',
+    'CREATE TABLE IF NOT EXISTS OSW_BASELINE_FILES (NAME TEXT PRIMARY KEY, BYTES INTEGER);',
+  ]
+
+  try:
+    Db = connect(FileName, isolation_level=None)
+    for sql in Tables:
+      Db.execute(sql)
+  except:
+    print("Cannot open baseline file: %s" % FileName)
+    exit(1)
+
+  return(Db)
+# ---------------------------------------------------------------------------
+# End OpenBaseline()
+# ---------------------------------------------------------------------------
+
+
+# ---------------------------------------------------------------------------
+# Def : WindowMeans()
+# Desc: Reduces the rows parsed from one file to the mean of each baseline
+#       metric per host, key and time window.
+# Args: 1-Rows returned by a parser (Data)
+#       2-Column names returned by a parser (Header)
+#       3-File type (FileType)
+#       4-Window length in seconds (WindowSecs)
+# Retn: Sorted list of (window epoch, host, key, metric, mean)
+# ---------------------------------------------------------------------------
+def WindowMeans(Data, Header, FileType, WindowSecs):
+  KeyName, Metrics = BaselineMetrics[FileType]
+  HostCol = Header.index('hostname')
+  TsCol   = Header.index('timestamp')
+  KeyCol  = Header.index(KeyName) if KeyName else None
+  Cols    = [ Header.index(metric) for metric in Metrics ]
+  Cache   = {}
+  Sums    = {}
+
+  for row in Data:
+    ts = row[TsCol]
+    if (ts not in Cache):
+      Cache[ts] = Epoch(ts)
+    window = Cache[ts] - (Cache[ts] % WindowSecs)
+    group  = (window, row[HostCol], row[KeyCol] if KeyCol is not None else '')
+    if (group not in Sums):
+      Sums[group] = [0, [0.0] * len(Cols)]
+    Sums[group][0] += 1
+    for i, col in enumerate(Cols):
+      Sums[group][1][i] += row[col]
+
+  Means = []
+  for group in Sums:
+    count, totals = Sums[group]
+    for i, metric in enumerate(Metrics):
+      Means.append(group + (metric, totals[i] / count))
+  Means.sort()
+  return(Means)
+# ---------------------------------------------------------------------------
+# End WindowMeans()
+# ---------------------------------------------------------------------------
+
+
+# ---------------------------------------------------------------------------
+# Def : ScanAnomalies()
+# Desc: Streams the iostat/vmstat files in FileDict one file at a time
+#       through the baselines in Db. Each window mean is compared with
+#       the baseline of its hour of the week and then folded into it as an
+#       exponentially weighted mean/variance. Each new window is weighted
+#       by Alpha and the weight of the older windows decays, so the
+#       baselines follow gradual changes in the workload instead of
+#       averaging over all history. Only one file is held in memory.
+#       Files already scanned (same name and size) are skipped and windows
+#       at or before the host's mark are not folded in twice, so scanning
+#       the same archive again only adds what is new. The baselines are
+#       committed after each file, before its anomalies are yielded, so no
+#       transaction is open while the caller handles them.
+# Args: 1-Baseline connection from OpenBaseline() (Db)
+#       2-Dictionary of files from InputFiles() (FileDict)
+#       3-Window length in seconds (WindowSecs)
+#       4-Deviation threshold in standard deviations (Threshold)
+#       5-Samples a baseline needs before it is used (MinSamples)
+#       6-Dictionary filled with counts for the caller (Stats)
+#       7-Weight of each new window in the baseline, 0-1 (Alpha)
+# Retn: Generator of anomalies:
+#       (window epoch, host, type, key, metric, value, mean, stddev, z, n)
+# ---------------------------------------------------------------------------
+def ScanAnomalies(Db, FileDict, WindowSecs=300, Threshold=3.0, MinSamples=4, Stats=None, Alpha=0.05):
+  if (Stats is None):
+    Stats = {}
+  Curs     = Db.cursor()
+  FileList = sorted([ f for f in FileDict if FileDict[f]['type'] in BaselineMetrics ], key=lambda f: (FileDict[f]['host'], FileDict[f]['type'], FileDict[f]['name']))
+  for name in ['files', 'skipped', 'windows', 'anomalies']:
+    Stats[name] = 0
+
+  for FileName in FileList:
+    FileType = FileDict[FileName]['type']
+    FileKey  = FileDict[FileName]['host'] + '/' + FileDict[FileName]['name']
+    Curs.execute('SELECT BYTES FROM OSW_BASELINE_FILES WHERE NAME = ?;', [FileKey])
+    Row = Curs.fetchone()
+    if (Row is not None and Row[0] == FileDict[FileName]['bytes']):
+      Stats['skipped'] += 1
+      continue
+
+    try:
+      (data, header, hostname) = ParseFile(FileName, FileType)
+    except ParseError as e:
+      print("\n%s" % e)
+      exit(1)
+    Stats['files'] += 1
+    Anomalies = []
+    Curs.execute('BEGIN')
+    if (data):
+      Curs.execute('SELECT WINDOW FROM OSW_BASELINE_MARK WHERE HOSTNAME = ? AND TYPE = ?;', [hostname, FileType])
+      Row  = Curs.fetchone()
+      Mark = Row[0] if Row is not None else -1
+
+      Curs.execute('SELECT KEY, METRIC, HOW, N, MEAN, VAR FROM OSW_BASELINE WHERE HOSTNAME = ? AND TYPE = ?;', [hostname, FileType])
+      Baseline = dict([ ((Row[0], Row[1], Row[2]), [Row[3], Row[4], Row[5]]) for Row in Curs ])
+      Changed  = set()
+
+      for (window, host, key, metric, value) in WindowMeans(data, header, FileType, WindowSecs):
+        if (window <= Mark):
+          continue
+        Stats['windows'] += 1
+        tm   = gmtime(window)
+        how  = tm.tm_wday * 24 + tm.tm_hour
+        base = Baseline.setdefault((key, metric, how), [0, 0.0, 0.0])
+        n, mean, var = base
+
+        # Compare with the baseline before folding the value in.
+        if (n >= MinSamples):
+          stddev = sqrt(var)
+          if (stddev > 0):
+            z = (value - mean) / stddev
+            if (abs(z) > Threshold):
+              Stats['anomalies'] += 1
+              Anomalies.append((window, host, FileType, key, metric, round(value, 2), round(mean, 2), round(stddev, 2), round(z, 2), n))
+
+        if (n == 0):
+          mean = value
+        else:
+          delta = value - mean
+          mean += Alpha * delta
+          var   = (1 - Alpha) * (var + Alpha * delta * delta)
+        n += 1
+        Baseline[(key, metric, how)] = [n, mean, var]
+        Changed.add((key, metric, how))
+        LastWindow = window
+
+      if (Changed):
+        Curs.executemany('INSERT OR REPLACE INTO OSW_BASELINE VALUES (?, ?, ?, ?, ?, ?, ?, ?);',
+          [ (hostname, FileType) + key + tuple(Baseline[key]) for key in Changed ])
+        Curs.execute('INSERT OR REPLACE INTO OSW_BASELINE_MARK VALUES (?, ?, ?);', [hostname, FileType, LastWindow])
+
+    Curs.execute('INSERT OR REPLACE INTO OSW_BASELINE_FILES VALUES (?, ?);', [FileKey, FileDict[FileName]['bytes']])
+    Curs.execute('COMMIT')
+
+    for anomaly in Anomalies:
+      yield anomaly
+# ---------------------------------------------------------------------------
+# End ScanAnomalies()
+# ---------------------------------------------------------------------------
+
+
+# ---------------------------------------------------------------------------
+# Def : PrintDataDefinition()
+# Desc: Prints the data definition.
+# Args: 1-dictionary of data definitions (DataDef) defined as:
+#         data_def[id]['raw_name']
+#         data_def[id]['column_name']
+#         data_def[id]['type']
+# Retn: <none>
+# ---------------------------------------------------------------------------
+def PrintDataDefinition(DataDef):
+  print("%-3s  %-20s  %-20s  %-10s" % ('ID','Heading','Column','Type'))
+  print("%-3s  %-20s  %-20s  %-10s" % ('-'*2,'-'*20,'-'*20,'-'*10))
+  for id in sorted(DataDef):
+    print("%-3s  %-20s  %-20s  %-10s" % (id, DataDef[id]['raw_name'], DataDef[id]['column_name'], DataDef[id]['type']))
+# ---------------------------------------------------------------------------
+# End PrintDataDefinition()
+# ---------------------------------------------------------------------------
+
+
+# ---------------------------------------------------------------------------
+# Def : FindColumn()
+# Desc: Looks up a column by heading or column name (case insensitive).
+# Args: 1-column heading or name (Col)
+#       2-data_def (data definition dictionary) (DataDef)
+# Retn: data_def key of the column
+# ---------------------------------------------------------------------------
+def FindColumn(Col, DataDef):
+  for key in DataDef:
+    if Col.upper() == DataDef[key]['column_name'].upper() or Col.upper() == DataDef[key]['raw_name'].upper():
+      return(key)
+
+  print("\nInvalid column specified: %s\n" % Col)
+  print("Column must be one of Heading/Column below, (case insensitive)...\n")
+  PrintDataDefinition(DataDef)
+  exit(1)
+# ---------------------------------------------------------------------------
+# End FindColumn()
+# ---------------------------------------------------------------------------
+
+
+# ---------------------------------------------------------------------------
+# Def : ParseFilter()
+# Desc: Adds the filter criteria from the command line to the data
+#       definition. Values are converted to the column data type here
+#       since they are passed to the query as bind values (never pasted
+#       into the SQL).
+# Args: 1-filter (from command line option) (Filter)
+#       2-data_def (data definition dictionary) (DataDef)
+#       3-Name of the calling command, used in the examples (Cmd)
+# Retn: 1-updated dictionary of data definitions:
+#         data_def[col_id]['raw_name']     = str
+#         data_def[col_id]['column_name']  = str
+#         data_def[col_id]['type']         = str
+#         data_def[col_id]['order']        = str
+#         data_def[col_id]['filter']       = [oper,val]
+# ---------------------------------------------------------------------------
+def ParseFilter(Filter, DataDef, Cmd):
+
+  # Formulate filter criteria (where clause)
+  # -----------------------------------------
+  filters = []
+  operators = ['<','>','=']
+  for t in Filter.replace(' ', '').split(','):
+    count = 0
+    for oper in operators:
+      count += t.count(oper)
+    if (count > 1 or count == 0):
+      print("Malformed filter specified: %s" % t)
+      print("\nValid operators for filter are: < >")
+      print("  Ex: %s -f 'b>20,r>10,sys>20'"  % (Cmd))
+      print("  Ex: %s -f 'id>20'"             % (Cmd))
+      print("  Ex: %s -f 'wa > 30'"           % (Cmd))
+      print("  Ex: %s -f 'so > 20'"           % (Cmd))
+      exit(1)
+
+    for oper in operators:
+      if (len(t.split(oper)) == 2):
+        col,val = t.split(oper)
+        filters.append([col, oper, val])
+
+  # Validate filter column name and map to database column name.
+  for idx, row in enumerate(filters):
+    valid = False
+    col   = row[0]
+    oper  = row[1]
+    val   = row[2]
+    for key in DataDef:
+      if col.upper() == DataDef[key]['column_name'].upper():
+        valid = True
+        filters[idx][0] = DataDef[key]['column_name']
+        DataDef[key]['filter'] = [oper, val]
+      elif col.upper() == DataDef[key]['raw_name'].upper():
+        valid = True
+        filters[idx][0] = DataDef[key]['column_name'].upper()
+        DataDef[key]['filter'] = [oper, val]
+    if not valid:
+      print("\nInvalid filter column specified: %s\n" % col)
+      print("Filter column must be one or more of Heading/Column below, (case insensitive)...\n")
+      PrintDataDefinition(DataDef)
+      exit(1)
+
+  # Finalize the filter criteria and add it to the data definition.
+  for row in filters:
+    col  = row[0]
+    oper = row[1]
+    val  = row[2]
+    for key in DataDef:
+      if col == DataDef[key]['column_name']:
+        dtype = DataDef[key]['type']
+        val = val.replace("'",'').replace('"','').strip()  # remove quotes and leading/trailing spaces...
+        try:
+          if dtype == 'INTEGER':
+            val = int(val) if match(r'^-?\d+$', val) else float(val)
+          elif dtype == 'REAL':
+            val = float(val)
+        except ValueError:
+          print("\nInvalid filter value specified: %s%s%s" % (DataDef[key]['raw_name'], oper, val))
+          print("Expected a numeric value for column: %s" % col)
+          exit(1)
+        DataDef[key]['filter'] = [ oper, val ]
+
+  return(DataDef)
+# ---------------------------------------------------------------------------
+# End ParseFilter()
+# ---------------------------------------------------------------------------
+
+
+# ---------------------------------------------------------------------------
+# Def : ParseOrder()
+# Desc: Adds the sort order from the command line (or the default sort
+#       order if none was given) to the data definition.
+# Args: 1-order (from command line option) (Order)
+#       2-data_def (data definition dictionary) (DataDef)
+#       3-List of column names sorted on by default (DefaultOrder)
+# Retn: 1-updated dictionary of data definitions:
+#         data_def[col_id]['raw_name']     = str
+#         data_def[col_id]['column_name']  = str
+#         data_def[col_id]['type']         = str
+#         data_def[col_id]['order']        = str
+#         data_def[col_id]['filter']       = [oper,val]
+# ---------------------------------------------------------------------------
+def ParseOrder(Order, DataDef, DefaultOrder=[]):
+
+  # Formulate sort order (order by)
+  # --------------------------------
+  if (Order == ''):  # default sort order
+    for idx,col in enumerate(DefaultOrder):
+      for key in DataDef:
+        if col == DataDef[key]['column_name']:
+          DataDef[key]['order'] = idx + 1
+  else:  # custom sort order
+    # Validate sort column names and map to database column name.
+    Order = ''.join(Order.split()).split(',')
+    for idx,col in enumerate(Order):
+      valid = False
+      for key in DataDef:
+        if col.upper() == DataDef[key]['column_name'].upper() or col.upper() == DataDef[key]['raw_name'].upper():
+          valid = True
+          DataDef[key]['order'] = idx + 1
+      if not valid:
+        print("\nInvalid sort column specified: %s\n" % col)
+        print("Sort column must be one or more of Heading/Column below, (case insensitive)...\n")
+        PrintDataDefinition(DataDef)
+        exit(1)
+
+  return(DataDef)
+# ---------------------------------------------------------------------------
+# End ParseOrder()
+# ---------------------------------------------------------------------------
+
+
+# ---------------------------------------------------------------------------
+# Def : BuildWhere()
+# Desc: Compiles the filter criteria from the data definition into a where
+#       clause with bind parameters.
+# Args: 1-data_def (data definition dictionary) (DataDef)
+# Retn: 1-where clause without the WHERE keyword (str),
+#       2-list of bind values (binds)
+# ---------------------------------------------------------------------------
+def BuildWhere(DataDef):
+  binds     = []
+  where_set = []
+
+  for key in sorted(DataDef):
+    if DataDef[key]['filter'] != [None, None]:
+      col = DataDef[key]['column_name']
+      oper, val = DataDef[key]['filter']
+      where_set.append("%s %s ?" % (col, oper))
+      binds.append(val)
+
+  return('\n     AND '.join(where_set), binds)
+# ---------------------------------------------------------------------------
+# End BuildWhere()
+# ---------------------------------------------------------------------------
+
+
+# ---------------------------------------------------------------------------
+# Def : SortColumns()
+# Desc: Returns the sort columns from the data definition in sort order.
+# Args: 1-data_def (data definition dictionary) (DataDef)
+# Retn: List of column names
+# ---------------------------------------------------------------------------
+def SortColumns(DataDef):
+  order_dict = {}
+  for key in sorted(DataDef):
+    if DataDef[key]['order']:
+      order_dict[DataDef[key]['order']] = key
+
+  return([ DataDef[order_dict[key]]['column_name'] for key in sorted(order_dict) ])
+# ---------------------------------------------------------------------------
+# End SortColumns()
+# ---------------------------------------------------------------------------
+
+
+# ---------------------------------------------------------------------------
+# Def : BuildQuery()
+# Desc: Compiles the report query from the data definition. Filter values
+#       are returned as bind parameters rather than concatenated into the
+#       SQL text.
+# Args: 1-Table name (Table)
+#       2-data_def (data definition dictionary) (DataDef)
+#       3-List of raw column names to select, all columns are selected if
+#         this is empty (Columns)
+# Retn: 1-sql statement (str), 2-list of bind values (binds)
+# ---------------------------------------------------------------------------
+def BuildQuery(Table, DataDef, Columns=[]):
+
+  # Generate column names and aliases for the select statement.
+  # for examle: column AS "mycol"
+  # ------------------------------------------------------------
+  col_set = []
+  for key in sorted(DataDef):
+    if (Columns == [] or DataDef[key]['raw_name'] in Columns):
+      hname = DataDef[key]['raw_name'].upper()
+      cname = DataDef[key]['column_name'].upper()
+      alias = ' AS "' + hname + '"'
+      col_set.append("%-25s %-s" % (cname, alias))
+
+  # Generate where clause...
+  where, binds = BuildWhere(DataDef)
+
+  # Generate order by clause...
+  order = ',\n         '.join(SortColumns(DataDef))
+
+  # Assemble the sql statement...
+  sql  = '  SELECT '
+  sql += ',\n         '.join(col_set)
+  sql += "\n    FROM " + Table
+  if (where != ''):
+    sql += "\n   WHERE " + where
+  if (order != ''):
+    sql += "\nORDER BY " + order
+  sql += ";"
+
+  return(sql, binds)
+# ---------------------------------------------------------------------------
+# End BuildQuery()
+# ---------------------------------------------------------------------------
+
+
+# ---------------------------------------------------------------------------
+# Def : CreateIndex()
+# Desc: Creates an index on one or more columns of a table unless it
+#       already exists. The index name is derived from the column names.
+# Args: 1-Cursor (Curs)
+#       2-Table name (Table)
+#       3-List of column names (Cols)
+# Retn: Index name
+# ---------------------------------------------------------------------------
+def CreateIndex(Curs, Table, Cols):
+  IndexName = Table + '_IX_' + '_'.join(Cols)
+  sql = 'CREATE INDEX IF NOT EXISTS ' + IndexName + ' ON ' + Table + ' (' + ', '.join(Cols) + ');'
+  try:
+    Curs.execute(sql)
+  except:
+    print("Cannot create index: %s" % sql)
+    exit(1)
+
+  return(IndexName)
+# ---------------------------------------------------------------------------
+# End CreateIndex()
+# ---------------------------------------------------------------------------
+
+
+# ---------------------------------------------------------------------------
+# Def : CreateIndexes()
+# Desc: Creates the secondary indexes on a table. This is done after the
+#       bulk load completes since it is much cheaper to build an index once
+#       than to maintain it row by row during the load.
+# Args: 1-Cursor (Curs)
+#       2-Table name (Table)
+#       3-data_def (data definition dictionary) (DataDef)
+#       4-List of column names to index (IndexCols)
+# Retn: List of indexes created
+# ---------------------------------------------------------------------------
+def CreateIndexes(Curs, Table, DataDef, IndexCols):
+  Indexes = []
+  Columns = [ DataDef[key]['column_name'] for key in sorted(DataDef) ]
+
+  for col in IndexCols:
+    if col in Columns:
+      Indexes.append(CreateIndex(Curs, Table, [col]))
+
+  # Gather optimizer statistics for the new indexes.
+  if Indexes:
+    AnalyzeTable(Curs, Table)
+
+  return(Indexes)
+# ---------------------------------------------------------------------------
+# End CreateIndexes()
+# ---------------------------------------------------------------------------
+
+
+# ---------------------------------------------------------------------------
+# Def : InMemory()
+# Desc: Tells whether the main database of a cursor is an in-memory
+#       (:memory:) database.
+# Args: 1-Cursor (Curs)
+# Retn: True/False
+# ---------------------------------------------------------------------------
+def InMemory(Curs):
+  for row in Curs.connection.execute('PRAGMA database_list;').fetchall():
+    if (row[1] == 'main'):
+      return(row[2] == '')
+  return(False)
+# ---------------------------------------------------------------------------
+# End InMemory()
+# ---------------------------------------------------------------------------
+
+
+# ---------------------------------------------------------------------------
+# Def : AnalyzeTable()
+# Desc: Gathers optimizer statistics for a table. This is skipped for an
+#       in-memory database, which is loaded, queried once and thrown away.
+# Args: 1-Cursor (Curs)
+#       2-Table name (Table)
+# Retn: <none>
+# ---------------------------------------------------------------------------
+def AnalyzeTable(Curs, Table):
+  if InMemory(Curs):
+    return
+
+  try:
+    Curs.execute('ANALYZE ' + Table + ';')
+  except:
+    print("Cannot analyze table: %s" % Table)
+    exit(1)
+# ---------------------------------------------------------------------------
+# End AnalyzeTable()
+# ---------------------------------------------------------------------------
+
+
+# ---------------------------------------------------------------------------
+# Def : EnsureIndexes()
+# Desc: Creates at most one index on demand, matching the query:
+#         - with a filter, an index on the filtered columns (the equality
+#           columns first, then one range column) so the matching rows are
+#           found with an index range scan;
+#         - otherwise, if a sort order was requested (-o), an index on the
+#           sort columns so the rows are read in order without a sort.
+#       Nothing is built for the default sort order; the rows were loaded
+#       in that order and the sort is cheaper than building the index.
+# Args: 1-Cursor (Curs)
+#       2-Table name (Table)
+#       3-data_def (data definition dictionary) (DataDef)
+#       4-Index the sort columns (IndexSort)
+# Retn: List of indexes used
+# ---------------------------------------------------------------------------
+def EnsureIndexes(Curs, Table, DataDef, IndexSort=False):
+  Indexes = []
+  EqCols  = []
+  RangeCols = []
+
+  for key in sorted(DataDef):
+    if DataDef[key]['filter'] != [None, None]:
+      if (DataDef[key]['filter'][0] == '='):
+        EqCols.append(DataDef[key]['column_name'])
+      else:
+        RangeCols.append(DataDef[key]['column_name'])
+
+  if (EqCols or RangeCols):
+    Indexes.append(CreateIndex(Curs, Table, EqCols + RangeCols[:1]))
+  elif (IndexSort and SortColumns(DataDef)):
+    Indexes.append(CreateIndex(Curs, Table, SortColumns(DataDef)))
+
+  if Indexes:
+    AnalyzeTable(Curs, Table)
+
+  return(Indexes)
+# ---------------------------------------------------------------------------
+# End EnsureIndexes()
+# ---------------------------------------------------------------------------
+
+
+# ---------------------------------------------------------------------------
+# Def : RunQuery()
+# Desc: Compiles and executes the report query. Rows are left in the
+#       cursor so the caller can stream them.
+# Args: 1-Cursor (Curs)
+#       2-Table name (Table)
+#       3-data_def (data definition dictionary) (DataDef)
+#       4-List of raw column names to select (Columns)
+#       5-Index the sort columns, see EnsureIndexes() (IndexSort)
+# Retn: Cursor
+# ---------------------------------------------------------------------------
+def RunQuery(Curs, Table, DataDef, Columns=[], IndexSort=False):
+  EnsureIndexes(Curs, Table, DataDef, IndexSort)
+  sql, binds = BuildQuery(Table, DataDef, Columns)
+
+  try:
+    Curs.execute(sql, binds)
+  except:
+    print("Error in execution of report SQL: %s\n" % sql)
+    print("Bind values: %s\n" % binds)
+    exit(1)
+
+  return(Curs)
+# ---------------------------------------------------------------------------
+# End RunQuery()
+# ---------------------------------------------------------------------------
+
+
+# ---------------------------------------------------------------------------
+# Def : DefaultReport()
+# Desc: Prints the default report. Rows are streamed out of the cursor a
+#       page at a time and column widths are computed from each page as it
+#       is printed, so no separate pass over the table is needed to size
+#       them.
+# Args: 1-Cursor (Curs)
+#       2-Table name (Table)
+#       3-data_def (data definition dictionary) (DataDef)
+#       4-Index the sort columns, see EnsureIndexes() (IndexSort)
+# Retn: <none>
+# ---------------------------------------------------------------------------
+def DefaultReport(Curs, Table, DataDef, IndexSort=False):
+  PageSize = 30
+
+  # Create a list of column names for the report...
+  header = [ DataDef[key]['raw_name'] for key in sorted(DataDef) ]
+  max_width = [ len(col) for col in header ]
+
+  # Execute the query...
+  # ------------------------------------------------------------
+  RunQuery(Curs, Table, DataDef, [], IndexSort)
+
+  # Print the report a page at a time...
+  # ------------------------------------------------------------
+  first_page = True
+  while True:
+    page = Curs.fetchmany(PageSize)
+    if not page:
+      break
+
+    # Expand column widths to fit the data on this page.
+    # ----------------------------------------------------
+    for row in page:
+      for i, val in enumerate(row):
+        width = len(str(val))
+        if (width > max_width[i]):
+          max_width[i] = width
+
+    # Generate a string format for the output. Number columns will
+    # be right justified and strings will be left justified.
+    # -------------------------------------------------------------
+    i = 0
+    fmtstr = ""
+    for key in sorted(DataDef):
+      if (DataDef[key]['type'] in ('INTEGER','REAL')):
+        fmtstr += "%" + str(max_width[i]) + 's '
+      else:
+        fmtstr += "%-" + str(max_width[i]) + 's '
+      i += 1
+
+    # Print page header
+    dash_line = [ '-' * width for width in max_width ]
+    if (first_page):
+      print(fmtstr % tuple((header)))
+      first_page = False
+    else:
+      print('\n' + fmtstr % tuple((header)))
+    print(fmtstr % tuple((dash_line)))
+
+    # Print the data rows
+    for row in page:
+      print(fmtstr % row)
+# ---------------------------------------------------------------------------
+# End DefaultReport()
+# ---------------------------------------------------------------------------
+
+
+# ---------------------------------------------------------------------------
+# Def : CsvReport()
+# Desc: Prints a report in CSV format.
+# Args: 1-Cursor (Curs)
+#       2-Table name (Table)
+#       3-data_def (data definition dictionary) (DataDef)
+#       4-Index the sort columns, see EnsureIndexes() (IndexSort)
+# Retn: <none>
+# ---------------------------------------------------------------------------
+def CsvReport(Curs, Table, DataDef, IndexSort=False):
+
+  # Create a list of column names for the report...
+  header = [ DataDef[key]['raw_name'].upper() for key in sorted(DataDef) ]
+
+  # Execute the query...
+  # ------------------------------------------------------------
+  RunQuery(Curs, Table, DataDef, [], IndexSort)
+
+  # Print the CSV report...
+  # -------------------------
+  print('\n"' + '","'.join(header) + '"')
+  for row in Curs:
+    row = list(row)
+    for i in range(len(row)):
+      if (type(row[i]) != str):
+        row[i] = str(row[i])
+      else:
+        row[i] = '"' + row[i] + '"'
+    print(','.join(row))
+# ---------------------------------------------------------------------------
+# End CsvReport()
+# ---------------------------------------------------------------------------
+
+
+# ---------------------------------------------------------------------------
+# Def : AlignedReport()
+# Desc: Prints a time series of a metric averaged per minute with one
+#       column per host, so samples from different nodes line up on the
+#       same row. Rows are grouped by the minute and the key columns
+#       (ex. device).
+# Args: 1-Cursor (Curs)
+#       2-Table name (Table)
+#       3-data_def (data definition dictionary) (DataDef)
+#       4-metric heading or column name (Metric)
+#       5-List of key column headings (Keys)
+# Retn: <none>
+# ---------------------------------------------------------------------------
+def AlignedReport(Curs, Table, DataDef, Metric, Keys):
+  PageSize = 30
+  ts_col   = DataDef[FindColumn('timestamp', DataDef)]['column_name']
+  host_col = DataDef[FindColumn('hostname', DataDef)]['column_name']
+  val_col  = DataDef[FindColumn(Metric, DataDef)]['column_name']
+  key_cols = [ DataDef[FindColumn(col, DataDef)]['column_name'] for col in Keys ]
+  minute   = 'substr(' + ts_col + ', 1, 16)'
+
+  if DataDef[FindColumn(Metric, DataDef)]['type'] not in ('INTEGER','REAL'):
+    print("\nMetric must be a numeric column: %s" % Metric)
+    exit(1)
+
+  try:
+    hosts = [ row[0] for row in Curs.execute('SELECT DISTINCT ' + host_col + ' FROM ' + Table + ' ORDER BY 1;').fetchall() ]
+  except:
+    print("Error in execution of host list SQL.\n")
+    exit(1)
+
+  # Assemble the sql statement...
+  where, binds = BuildWhere(DataDef)
+  group_set = [ minute ] + key_cols
+  sql  = '  SELECT '
+  sql += ',\n         '.join(group_set + [ host_col, 'avg(' + val_col + ')' ])
+  sql += "\n    FROM " + Table
+  if (where != ''):
+    sql += "\n   WHERE " + where
+  sql += "\nGROUP BY " + ', '.join(group_set + [ host_col ])
+  sql += "\nORDER BY " + ', '.join(group_set + [ host_col ]) + ";"
+
+  # Size the key columns from the distinct key values (read from the
+  # key column index rather than the table).
+  # ------------------------------------------------------------------
+  key_width = []
+  for idx, col in enumerate(key_cols):
+    CreateIndex(Curs, Table, [col])
+    width = Curs.execute('SELECT max(length(' + col + ')) FROM (SELECT DISTINCT ' + col + ' FROM ' + Table + ');').fetchone()[0]
+    key_width.append(max(len(Keys[idx]), width or 0))
+
+  CreateIndex(Curs, Table, [ts_col])
+  try:
+    Curs.execute(sql, binds)
+  except:
+    print("Error in execution of report SQL: %s\n" % sql)
+    exit(1)
+
+  # Print the report, one line per minute/key with a column per host.
+  # ------------------------------------------------------------------
+  header    = [ 'minute' ] + Keys + hosts
+  fmtstr    = '%-16s ' + ''.join([ '%-' + str(width) + 's ' for width in key_width ]) + '%15s ' * len(hosts)
+  dash_line = [ '-' * 16 ] + [ '-' * width for width in key_width ] + [ '-' * 15 ] * len(hosts)
+  print('%s per minute by host' % DataDef[FindColumn(Metric, DataDef)]['raw_name'])
+
+  lc      = PageSize
+  row_key = None
+  values  = {}
+  for row in chain(Curs, [None]):     # None flushes the last line.
+    if (row is None or row[:-2] != row_key):
+      if (row_key is not None):
+        if (lc >= PageSize):
+          print('\n' + fmtstr % tuple(header))
+          print(fmtstr % tuple(dash_line))
+          lc = 0
+        print(fmtstr % (tuple(row_key) + tuple([ '%.2f' % values[h] if h in values else '' for h in hosts ])))
+        lc += 1
+      if (row is None):
+        break
+      row_key = row[:-2]
+      values  = {}
+    values[row[-2]] = row[-1]
+# ---------------------------------------------------------------------------
+# End AlignedReport()
+# ---------------------------------------------------------------------------
+
+
+# ---------------------------------------------------------------------------
+# Def : ExportColumns()
+# Desc: Exports the loaded (and filtered/sorted) rows to a columnar
+#       directory so later analyses don't have to parse the text files
+#       again. Layout:
+#         <export_dir>/meta.json        column names, types, encodings,
+#                                       dictionaries
+#         <export_dir>/<column>.npy     one typed NumPy array per column
+#       Columns are stored as int64/float64 (float64 with NaN if the column
+#       has NULLs), timestamps as datetime64[s] and text columns
+#       dictionary-encoded as int32 codes into the list stored in
+#       meta.json. Reload a column memory-mapped with:
+#         numpy.load(<export_dir>/<column>.npy, mmap_mode='r')
+# Args: 1-Cursor (Curs)
+#       2-Table name (Table)
+#       3-data_def (data definition dictionary) (DataDef)
+#       4-Export directory (ExportDir)
+#       5-Name of the exporting command, stored in meta.json (Source)
+#       6-Index the sort columns, see EnsureIndexes() (IndexSort)
+# Retn: <none>
+# ---------------------------------------------------------------------------
+def ExportColumns(Curs, Table, DataDef, ExportDir, Source, IndexSort=False):
+  try:
+    import numpy as np
+  except ImportError:
+    print("The numpy module is required to export columns.")
+    exit(1)
+
+  export_start = time()
+  keys = sorted(DataDef)
+  rows = RunQuery(Curs, Table, DataDef, [], IndexSort).fetchall()
+  if (rows == []):
+    print("No data to export.")
+    return
+  values = list(zip(*rows))
+  del rows
+
+  try:
+    if (not isdir(ExportDir)):
+      makedirs(ExportDir)
+  except:
+    print("Cannot create export directory: %s" % ExportDir)
+    exit(1)
+
+  meta = {
+    'format'  : 'osw-columns',
+    'version' : 1,
+    'source'  : Source,
+    'table'   : Table,
+    'rows'    : len(values[0]),
+    'columns' : [],
+  }
+  total_bytes = 0
+  for idx, key in enumerate(keys):
+    col_name = DataDef[key]['column_name']
+    raw_name = DataDef[key]['raw_name']
+    col_type = DataDef[key]['type']
+    column   = values[idx]
+    col_meta = {'name': raw_name, 'column_name': col_name, 'file': col_name + '.npy', 'encoding': 'plain'}
+
+    if (raw_name in ('timestamp', 'bucket')):
+      # vmstat timestamps carry a .N seconds offset within the sample.
+      ts  = [ (v or '')[:19].replace(' ', 'T') for v in column ]
+      off = [ int(v[20:]) if v and len(v) > 20 else 0 for v in column ]
+      arr = np.array(ts, dtype='datetime64[s]') + np.array(off, dtype='timedelta64[s]')
+      col_meta['encoding'] = 'timestamp'
+    elif (col_type == 'TEXT'):
+      dictionary = sorted(set([ '' if v is None else str(v) for v in column ]))
+      codes      = dict([ (v, i) for i, v in enumerate(dictionary) ])
+      arr = np.array([ codes['' if v is None else str(v)] for v in column ], dtype=np.int32)
+      col_meta['encoding']   = 'dictionary'
+      col_meta['dictionary'] = dictionary
+    elif (col_type == 'INTEGER' and None not in column):
+      arr = np.array(column, dtype=np.int64)
+    else:
+      arr = np.array([ np.nan if v is None else v for v in column ], dtype=np.float64)
+
+    col_meta['dtype'] = str(arr.dtype)
+    meta['columns'].append(col_meta)
+    np.save(pathjoin(ExportDir, col_meta['file']), arr)
+    total_bytes += arr.nbytes
+
+  try:
+    f = open(pathjoin(ExportDir, 'meta.json'), 'w')
+    dump(meta, f, indent=1)
+    f.close()
+  except:
+    print("Cannot write file: %s" % pathjoin(ExportDir, 'meta.json'))
+    exit(1)
+  export_secs = time() - export_start
+
+  # Time a memory-mapped reload of every column...
+  reload_start = time()
+  for col_meta in meta['columns']:
+    np.load(pathjoin(ExportDir, col_meta['file']), mmap_mode='r')
+  reload_secs = time() - reload_start
+
+  print("Exported: %s rows, %s columns (%d bytes) to %s in %.2f sec" % (meta['rows'], len(keys), total_bytes, ExportDir, export_secs))
+  print("Reload (memory-mapped): %.4f sec" % reload_secs)
+# ---------------------------------------------------------------------------
+# End ExportColumns()
+# ---------------------------------------------------------------------------
+
+
+# ---------------------------------------------------------------------------
+# Def : BucketStart()
+# Desc: Truncates a timestamp to the start of its interval. The timestamp
+#       must be zero padded (YYYY-MM-DD HH:MI:SS) and the interval must
+#       divide an hour evenly.
+# Args: 1-timestamp (Ts)
+#       2-interval in minutes (Minutes)
+# Retn: bucket start as YYYY-MM-DD HH:MI (str)
+# ---------------------------------------------------------------------------
+def BucketStart(Ts, Minutes):
+  if (Minutes >= 60):
+    return(Ts[:13] + ':00')
+  return(Ts[:14] + '%02d' % (int(Ts[14:16]) // Minutes * Minutes))
+# ---------------------------------------------------------------------------
+# End BucketStart()
+# ---------------------------------------------------------------------------
+
+
+# ---------------------------------------------------------------------------
+# Def : Percentile()
+# Desc: Nearest rank percentile of a sorted list of values.
+# Args: 1-sorted list of values (Values)
+#       2-percentile, 0-100 (Pct)
+# Retn: value
+# ---------------------------------------------------------------------------
+def Percentile(Values, Pct):
+  rank = int(ceil(Pct / 100.0 * len(Values)))
+  return(Values[max(rank, 1) - 1])
+# ---------------------------------------------------------------------------
+# End Percentile()
+# ---------------------------------------------------------------------------
+
+
+# ---------------------------------------------------------------------------
+# Def : RollupTable()
+# Desc: Returns the name of the rollup table for an interval.
+# Args: 1-Name of the table rolled up (Table)
+#       2-interval, ex. '5m' (Interval)
+# Retn: table name, ex. 'OSW_5M'
+# ---------------------------------------------------------------------------
+def RollupTable(Table, Interval):
+  return(Table.upper() + '_' + Interval.upper())
+# ---------------------------------------------------------------------------
+# End RollupTable()
+# ---------------------------------------------------------------------------
+
+
+# ---------------------------------------------------------------------------
+# Def : CreateRollups()
+# Desc: Builds one aggregate table per interval (see RollupTable()) holding
+#       the min/avg/max/p95/p99 of each metric per host, key (ex. device)
+#       and interval. All intervals are built in a single ordered pass over
+#       the raw rows, holding only the open bucket of each interval in
+#       memory.
+# Args: 1-Cursor (Curs)
+#       2-Table name (Table)
+#       3-data_def (data definition dictionary) (DataDef)
+#       4-List of metric headings (Metrics)
+#       5-List of key column headings (Keys)
+#       6-Dictionary of intervals {'5m' : 5, ...} (Intervals)
+# Retn: data definition dictionary of the rollup tables
+# ---------------------------------------------------------------------------
+def CreateRollups(Curs, Table, DataDef, Metrics, Keys, Intervals):
+  StatsSet = ['min','avg','max','p95','p99']
+  Prefix   = Table.upper() + '_'
+  ts_col   = DataDef[FindColumn('timestamp', DataDef)]['column_name']
+  host_col = DataDef[FindColumn('hostname', DataDef)]['column_name']
+  key_cols = [ DataDef[FindColumn(col, DataDef)]['column_name'] for col in Keys ]
+  val_cols = [ DataDef[FindColumn(col, DataDef)]['column_name'] for col in Metrics ]
+
+  # Formulate the data definition of the rollup tables...
+  RollupDef = {}
+  for col in [ host_col ] + key_cols:
+    key = FindColumn(col, DataDef)
+    RollupDef[len(RollupDef)] = { 'column_name' : col, 'raw_name' : DataDef[key]['raw_name'], 'type' : 'TEXT', 'order' : len(RollupDef) + 1, 'filter' : [None,None] }
+  RollupDef[len(RollupDef)] = { 'column_name' : Prefix + 'BUCKET', 'raw_name' : 'bucket', 'type' : 'TEXT', 'order' : len(RollupDef) + 1, 'filter' : [None,None] }
+  RollupDef[len(RollupDef)] = { 'column_name' : Prefix + 'SAMPLES', 'raw_name' : 'samples', 'type' : 'INTEGER', 'order' : None, 'filter' : [None,None] }
+  for idx, col in enumerate(val_cols):
+    for agg in StatsSet:
+      RollupDef[len(RollupDef)] = { 'column_name' : col + '_' + agg.upper(), 'raw_name' : Metrics[idx] + '_' + agg, 'type' : 'REAL', 'order' : None, 'filter' : [None,None] }
+
+  # Create the tables...
+  col_set = [ "%-25s%s" % (RollupDef[key]['column_name'], RollupDef[key]['type']) for key in sorted(RollupDef) ]
+  for interval in Intervals:
+    sql  = 'CREATE TABLE ' + RollupTable(Table, interval) + ' (\n   '
+    sql += ',\n   '.join(col_set)
+    sql += '\n);'
+    try:
+      Curs.execute(sql)
+    except:
+      print("Cannot create table: %s" % sql)
+      exit(1)
+
+  # Read the raw data in host, key, timestamp order (from the index).
+  # ------------------------------------------------------------------
+  group_cols = [ host_col ] + key_cols
+  CreateIndex(Curs, Table, group_cols + [ ts_col ])
+  sql  = '  SELECT ' + ', '.join(group_cols + [ ts_col ] + val_cols)
+  sql += '\n    FROM ' + Table
+  sql += '\nORDER BY ' + ', '.join(group_cols + [ ts_col ]) + ';'
+  ReadCurs = Curs.connection.cursor()
+  try:
+    ReadCurs.execute(sql)
+  except:
+    print("Error in execution of rollup SQL: %s\n" % sql)
+    exit(1)
+
+  insert = 'INSERT INTO %s VALUES (' + ', '.join([ '?' for key in RollupDef ]) + ');'
+  ng     = len(group_cols)
+  open_bucket = {}          # interval -> [group key, bucket, [values per metric]]
+  rows        = {}          # interval -> rows waiting to be inserted
+  for interval in Intervals:
+    open_bucket[interval] = None
+    rows[interval]        = []
+
+  Curs.execute('BEGIN')
+  for row in chain(ReadCurs, [None]):     # None flushes the open buckets.
+    for interval in Intervals:
+      if (row is not None):
+        group  = row[:ng]
+        bucket = BucketStart(row[ng], Intervals[interval])
+      current = open_bucket[interval]
+      if (current is not None and (row is None or current[0] != group or current[1] != bucket)):
+        out = list(current[0]) + [ current[1], len(current[2][0]) ]
+        for values in current[2]:
+          values = sorted([ val for val in values if val is not None ])
+          if values:
+            out += [ values[0], round(sum(values) / len(values), 2), values[-1], Percentile(values, 95), Percentile(values, 99) ]
+          else:
+            out += [ None ] * len(StatsSet)
+        rows[interval].append(out)
+        current = None
+        if (len(rows[interval]) >= 10000):
+          Curs.executemany(insert % RollupTable(Table, interval), rows[interval])
+          rows[interval] = []
+      if (row is not None):
+        if (current is None):
+          current = [ group, bucket, [ [] for col in val_cols ] ]
+        for idx, val in enumerate(row[ng + 1:]):
+          current[2][idx].append(val)
+      open_bucket[interval] = current
+
+  for interval in Intervals:
+    if rows[interval]:
+      Curs.executemany(insert % RollupTable(Table, interval), rows[interval])
+  Curs.execute('COMMIT')
+
+  return(RollupDef)
+# ---------------------------------------------------------------------------
+# End CreateRollups()
+# ---------------------------------------------------------------------------
+
+
+# ---------------------------------------------------------------------------
+# Def : NextFile()
+# Desc: Finds the file OSWatcher rolls over to after the one being followed,
+#       i.e. the oldest file in the same directory for the same host and
+#       type that sorts after it.
+# Args: 1-Name of the file being followed (FileName)
+#       2-File type, ex: 'iostat' (FileType)
+# Retn: FQN of the next file or '' if there isn't one yet.
+# ---------------------------------------------------------------------------
+def NextFile(FileName, FileType):
+  Path    = dirname(FileName)
+  Current = basename(FileName)
+  Pattern = compile(r'(^\S+)_(' + FileType + r')_([0-9]+).([0-9]+).([0-9]+).([0-9]+)\.dat$')
+  fhost   = Current.split('_' + FileType + '_')[0]
+
+  newer = []
+  try:
+    for file in listdir(Path or '.'):
+      found = Pattern.search(file)
+      if found and found.groups()[0] == fhost and file > Current:
+        newer.append(file)
+  except OSError:
+    return('')
+
+  if newer:
+    return(pathjoin(Path, min(newer)))
+  return('')
+# ---------------------------------------------------------------------------
+# End NextFile()
+# ---------------------------------------------------------------------------
+
+
+# ---------------------------------------------------------------------------
+# Def : RowMatches()
+# Desc: Evaluates the filter criteria of the data definition against one
+#       parsed row (used where the rows are not loaded into the database).
+# Args: 1-data_def (data definition dictionary) (DataDef)
+#       2-row of data (Row)
+# Retn: True/False
+# ---------------------------------------------------------------------------
+def RowMatches(DataDef, Row):
+  for key in DataDef:
+    oper, val = DataDef[key]['filter']
+    if oper is None:
+      continue
+    if (oper == '<' and not Row[key] < val):
+      return(False)
+    if (oper == '>' and not Row[key] > val):
+      return(False)
+    if (oper == '=' and not Row[key] == val):
+      return(False)
+  return(True)
+# ---------------------------------------------------------------------------
+# End RowMatches()
+# ---------------------------------------------------------------------------
+
+
+# ---------------------------------------------------------------------------
+# Def : FollowFile()
+# Desc: Follows the file OSWatcher is currently writing, like tail -f. Only
+#       the bytes appended since the last read are read and only complete
+#       samples are parsed (a sample is complete once the next "zzz ***"
+#       line has been written, or the file has been rolled over). The
+#       rollover check is made before the read so the old file is drained
+#       to EOF before switching to the next one. The column types are
+#       inferred once, from the first complete samples. The screen is
+#       refreshed with the most recent rows that pass the filter; only
+#       those rows are kept in memory.
+# Args: 1-Name of the file to follow (FileName)
+#       2-File type, ex: 'iostat' (FileType)
+#       3-filter (from command line option) (Filter)
+#       4-Seconds between reads (Interval)
+#       5-Number of matching rows to display (Rows)
+#       6-Name of the calling command (Cmd)
+#       7-Rows used to infer the column types (SampleSize)
+# Retn: <none>
+# ---------------------------------------------------------------------------
+def FollowFile(FileName, FileType, Filter, Interval, Rows, Cmd, SampleSize=1000):
+  Marker     = 'zzz ***'
+  DataDef    = {}
+  Recent     = deque(maxlen=Rows)
+  Offset     = 0
+  FileHeader = None
+  Pending    = ''
+  Samples    = 0
+  RowCount   = 0
+  Matched    = 0
+
+  while True:
+    # Check for a rollover first. Once the next file exists OSWatcher has
+    # stopped writing this one, so the read below drains it to EOF.
+    Rollover = NextFile(FileName, FileType)
+
+    # Read whatever has been appended since the last read...
+    try:
+      f = open(FileName, 'rb')
+      f.seek(Offset)
+      new = f.read()
+      f.close()
+    except:
+      print("Cannot open file for read: %s" % FileName)
+      exit(1)
+    Offset  += len(new)
+    Pending += new.decode('utf-8', 'replace')
+
+    # The header lines before the first sample are kept and put in
+    # front of each chunk so it parses like a whole file.
+    if (FileHeader is None):
+      pos = Pending.find(Marker)
+      if (pos >= 0):
+        FileHeader = Pending[:pos]
+        Pending = Pending[pos:]
+
+    complete = ''
+    if (FileHeader is not None):
+      if (Rollover != ''):
+        complete = Pending
+        Pending  = ''
+      else:
+        pos = Pending.rfind('\n' + Marker)
+        if (pos >= 0):
+          complete = Pending[:pos + 1]
+          Pending  = Pending[pos + 1:]
+
+    if (complete != ''):
+      try:
+        (stats, header, hostname) = Parsers[FileType](FileName, FileHeader + complete)
+      except ParseError as e:
+        print("\n%s" % e)
+        exit(1)
+      if (stats and DataDef == {}):
+        DataDef = DataDefinition(header, stats[:SampleSize])
+        if Filter != '':
+          ParseFilter(Filter, DataDef, Cmd)
+      sn = header.index('sn') if 'sn' in header else -1
+      last_sn = 0
+      for row in stats:
+        if (sn >= 0):
+          last_sn = row[sn]
+          row[sn] += Samples
+        RowCount += 1
+        if RowMatches(DataDef, row):
+          Recent.append(row)
+          Matched += 1
+      Samples += last_sn
+
+    # Refresh the summary...
+    # -----------------------
+    stdout.write('\033[H\033[2J')
+    print("%s  Following: %s  Offset: %s  Samples: %s  Rows: %s  Matched: %s\n" % (strftime('%Y-%m-%d %H:%M:%S'), FileName, Offset, Samples, RowCount, Matched))
+    if (DataDef != {} and Recent):
+      header    = [ DataDef[key]['raw_name'] for key in sorted(DataDef) ]
+      max_width = [ len(col) for col in header ]
+      for row in Recent:
+        for i, val in enumerate(row):
+          max_width[i] = max(max_width[i], len(str(val)))
+      fmtstr = ''
+      for i, key in enumerate(sorted(DataDef)):
+        if (DataDef[key]['type'] in ('INTEGER','REAL')):
+          fmtstr += "%" + str(max_width[i]) + 's '
+        else:
+          fmtstr += "%-" + str(max_width[i]) + 's '
+      print(fmtstr % tuple(header))
+      print(fmtstr % tuple([ '-' * width for width in max_width ]))
+      for row in Recent:
+        print(fmtstr % tuple(row))
+    stdout.flush()
+
+    # Roll over to the next hourly file or wait for more data.
+    # ---------------------------------------------------------
+    if (Rollover != ''):
+      FileName   = Rollover
+      Offset     = 0
+      FileHeader = None
+      Pending    = ''
+    else:
+      sleep(Interval)
+# ---------------------------------------------------------------------------
+# End FollowFile()
+# ---------------------------------------------------------------------------
@@ -0,0 +1,127 @@
+#!/bin/env python
+
+#--------------------------------------------------------------------------------------------------#
+# Name: test_update_oratab.py                                                                      #
+# Auth: agent                                                                                      #
+# Desc: Runs bin/update_oratab -n against a fake ssh (-S). The fake ssh runs the remote command    #
+#       locally, with /etc/oratab mapped to <node>.oratab in a temp dir, and writes login noise    #
+#       to stderr on every call.                                                                   #
+#                                                                                                  #
+#       python tests/test_update_oratab.py                                                         #
+#                                                                                                  #
+# Date       Ver. Who              Change Description                                              #
+# ---------- ---- ---------------- -------------------------------------------------------------   #
+# 10/19/2026 1.00 agent            Initial release.                                                #
+#--------------------------------------------------------------------------------------------------#
+
+# --------------------------------------
+# ---- Import Python Modules -----------
+# --------------------------------------
+from os           import chmod
+from os           import environ
+from os.path      import abspath
+from os.path      import dirname
+from os.path      import isfile
+from os.path      import join as pathjoin
+from shutil       import rmtree
+from subprocess   import Popen
+from subprocess   import PIPE
+from subprocess   import STDOUT
+from sys          import executable
+from tempfile     import mkdtemp
+import unittest
+
+Root    = dirname(dirname(abspath(__file__)))
+FakeSsh = '''#!/bin/sh
+# Skip the ssh options, then run the remote command here.
+while [ $# -gt 0 ]; do
+  case "$1" in
+    -o) shift 2 ;;
+    -O) exit 0 ;;
+    -*) shift ;;
+    *)  break ;;
+  esac
+done
+Node="$1"; shift
+echo "Welcome to $Node, unauthorized access prohibited." >&2
+exec sh -c "$(echo "$*" | sed "s#/etc/oratab#%s/$Node.oratab#g")"
+'''
+
+
+# --------------------------------------
+# ---- Class Definitions ---------------
+# --------------------------------------
+
+#---------------------------------------------------------------------------
+# Clas: TestUpdateOratab
+# Desc: update_oratab -n node1,node2 through the fake ssh.
+#---------------------------------------------------------------------------
+class TestUpdateOratab(unittest.TestCase):
+
+  def setUp(self):
+    self.TmpDir = mkdtemp(prefix='uot.')
+    self.Ssh    = pathjoin(self.TmpDir, 'ssh')
+    fh = open(self.Ssh, 'w')
+    fh.write(FakeSsh % self.TmpDir)
+    fh.close()
+    chmod(self.Ssh, 0o755)
+
+  def tearDown(self):
+    rmtree(self.TmpDir, True)
+
+  def Oratab(self, Node):
+    return(pathjoin(self.TmpDir, Node + '.oratab'))
+
+  def ReadOratab(self, Node):
+    fh = open(self.Oratab(Node), 'r')
+    Contents = fh.read()
+    fh.close()
+    return(Contents)
+
+  def WriteOratab(self, Node, Contents):
+    fh = open(self.Oratab(Node), 'w')
+    fh.write(Contents)
+    fh.close()
+
+  def Run(self):
+    Env = dict(environ)
+    Env['PYTHONPATH'] = pathjoin(Root, 'pylib')
+    Args = [executable, pathjoin(Root, 'bin', 'update_oratab'), '-n', 'node1:1,node2:2', '-d', 'MYDB', '-o', '/u01/db', '-S', self.Ssh]
+    proc = Popen(Args, stdin=PIPE, stdout=PIPE, stderr=STDOUT, env=Env, universal_newlines=True)
+    (Stdout, Stderr) = proc.communicate('y\n')
+    Status = {}
+    for Line in Stdout.split('\n'):
+      Words = Line.split()
+      if (len(Words) >= 2 and Words[0] in ('node1', 'node2')):
+        Status[Words[0]] = Words[1]
+    return(proc.returncode, Status, Stdout)
+
+  def test_missing_oratab(self):
+    (rc, Status, Stdout) = self.Run()
+    self.assertEqual(rc, 0, Stdout)
+    self.assertEqual(Status, {'node1': 'ADDED', 'node2': 'ADDED'}, Stdout)
+    self.assertEqual(self.ReadOratab('node1'), 'MYDB1:/u01/db:N\n')
+    self.assertEqual(self.ReadOratab('node2'), 'MYDB2:/u01/db:N\n')
+
+  def test_present_and_conflict(self):
+    self.WriteOratab('node1', '+ASM1:/u01/grid:N\nMYDB1:/u01/db:N\n')
+    self.WriteOratab('node2', 'MYDB2:/u01/other:N\n')
+    (rc, Status, Stdout) = self.Run()
+    self.assertEqual(rc, 1, Stdout)
+    self.assertEqual(Status, {'node1': 'PRESENT', 'node2': 'CONFLICT'}, Stdout)
+    self.assertEqual(self.ReadOratab('node2'), 'MYDB2:/u01/other:N\n')
+
+  def test_append(self):
+    self.WriteOratab('node1', '+ASM1:/u01/grid:N\n')
+    (rc, Status, Stdout) = self.Run()
+    self.assertEqual(rc, 0, Stdout)
+    self.assertEqual(Status, {'node1': 'ADDED', 'node2': 'ADDED'}, Stdout)
+    self.assertEqual(self.ReadOratab('node1'), '+ASM1:/u01/grid:N\nMYDB1:/u01/db:N\n')
+    self.assertTrue(isfile(self.Oratab('node2')))
+#---------------------------------------------------------------------------
+# End TestUpdateOratab
+#---------------------------------------------------------------------------
+
+
+if (__name__ == '__main__'):
+  unittest.main()